@@ -1,16 +1,96 @@
 import random
-from collections import deque, defaultdict
+import time
+from collections import Counter, deque, defaultdict
+
+from frontier import FrontierIndex
+from kernel import LowDegreeKernel
+from known_graph import KnownGraph
+from navigation import NavigationIndex
+from planners import make_planner
+from routing import TourPlanner
+from transposition import TranspositionTable
+
+# Outcomes of one (possibly budgeted) run of the iterative search.
+_SOLVED = "solved"
+_EXHAUSTED = "exhausted"   # whole tree explored, no solution
+_SUSPENDED = "suspended"   # per-turn budget ran out, search can be resumed
+
+
+class _TurnBudget:
+    """Per-turn work limit for the search (expanded nodes and/or wall-clock seconds)."""
+    __slots__ = ("node_limit", "deadline", "nodes")
+
+    def __init__(self, node_limit=None, time_limit=None):
+        self.node_limit = node_limit
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.nodes = 0
+
+    def exhausted(self):
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+class _SearchState:
+    """
+    Suspended depth-first search. Each frame is [node, ordered_values, next_index,
+    symmetric_colors]; every frame's node is assigned except while its next value is
+    being chosen. ``symmetric_colors`` is the class of interchangeable unused colors
+    of which only one was tried at that frame (empty if nothing was skipped).
+    """
+    __slots__ = ("root", "assignment", "unassigned", "domains", "stack", "expand",
+                 "best", "best_depth", "at_best", "color_use")
+
+    def __init__(self, root, assignment, unassigned, domains):
+        self.root = root                # fixed (non-variable) colors the search was built on
+        self.assignment = assignment
+        self.unassigned = unassigned
+        self.domains = domains
+        self.stack = []
+        self.expand = True              # next step picks a new variable
+        self.best = []                  # [(node, color)] of the deepest partial plan seen
+        self.best_depth = 0
+        self.at_best = False            # current path is deeper than the stored snapshot
+        # How many known nodes hold each color; colors at 0 are still interchangeable
+        self.color_use = Counter(c for c in assignment.values() if c is not None)
+
 
 class B22CH032:
     """
     My CSP agent code 
+
+    The global planner is anytime: pass ``node_budget`` (search nodes expanded per turn)
+    and/or ``time_budget`` (seconds per turn), e.g. via ``functools.partial(B22CH032,
+    node_budget=5000)``. When the budget runs out the deepest partial plan found so far
+    is used and the suspended search resumes on the next turn.
+
+    ``planner`` swaps the exact search for a planner engine from ``planners`` (a
+    planner object, or "min_conflicts" / "tabu" / "portfolio") for very large known graphs.
+
+    Each connected component of the unassigned nodes is solved separately and
+    memoized in a transposition table of ``memo_size`` entries (0 disables it);
+    its hit/miss counters are in ``self.transposition.stats()``.
+
+    With ``kernelize`` (default) nodes that can always be colored last are peeled
+    off first (see ``kernel``): the search only sees the remaining core and the
+    peeled nodes are colored greedily afterwards.
+
+    With ``route_planning`` (default) the agent travels along a short tour over the
+    known nodes still to be colored or explored. With nothing left on the tour it
+    heads for the frontier node with the best estimated information gain.
+
+    When the tour leads through nodes already colored in the game, the agent
+    submits the whole walk to the referee as one action plan (``get_action_plan``),
+    interrupted as soon as anything new or uncolored comes into view.
     """
-    def __init__(self, initial_state):
+    def __init__(self, initial_state, node_budget=None, time_budget=None, planner=None,
+                 memo_size=1024, route_planning=True, kernelize=True):
         print("B22CH032 CSP Agent Initialized.")
         # PERSISTENT STATE (Agent's Global Memory)
         self.all_nodes = set()
         self.adjacency = defaultdict(set)
-        self.edges_seen = set()
+        # Interned known graph; its merges report which nodes and edges are new
+        self.graph = KnownGraph(initial_state['available_colors'])
         # CSP State
         self.available_colors = initial_state['available_colors']
         self.pre_colored = {} # Nodes whose color cannot be changed (fixed constraints)
@@ -18,6 +98,23 @@ class B22CH032:
         # The single source of truth for the entire known graph's coloring
         # {node: color | None} - Best known valid assignment
         self.global_assignment = {}
+        # Anytime planning: per-turn budgets and the search suspended on a previous turn
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self._search = None
+        # Deepest partial plan of the suspended search, kept out of global_assignment
+        # so the next turn poses the same problem and the search can resume
+        self._partial_plan = {}
+        self.search_nodes_total = 0
+        self.planner = make_planner(planner)
+        self.transposition = TranspositionTable(memo_size) if memo_size else None
+        self.kernel = LowDegreeKernel(self.adjacency, len(self.available_colors)) if kernelize else None
+        # Shortest-path trees over the known graph, repaired as edges are discovered
+        self.navigation = NavigationIndex(self.adjacency)
+        self.router = TourPlanner(self.navigation) if route_planning else None
+        # Known nodes whose neighborhoods are not fully observed yet
+        self.frontier = FrontierIndex(self.adjacency)
+        self._route_target = None  # tour target of the last route move, for action plans
         
         self._update_knowledge(initial_state)
 
@@ -28,18 +125,21 @@ class B22CH032:
         self.current_position = visible_state['current_node']
         
         # 1. Update Graph Structure (Nodes and Edges)
-        for node in visible_state['visible_graph']['nodes']:
-            if node not in self.all_nodes:
-                self.all_nodes.add(node)
-                # Initialize new node as uncolored
-                self.global_assignment[node] = None 
-                
-        for u, v in visible_state['visible_graph']['edges']:
-            edge_tuple = tuple(sorted([u, v]))
-            if edge_tuple not in self.edges_seen:
-                self.edges_seen.add(edge_tuple)
-                self.adjacency[u].add(v)
-                self.adjacency[v].add(u)
+        result = self.graph.merge(visible_state)
+        names = self.graph.names
+        for i in result.new_nodes:
+            self.all_nodes.add(names[i])
+            # Initialize new node as uncolored
+            self.global_assignment[names[i]] = None
+
+        for a, b in result.new_edges:
+            u, v = names[a], names[b]
+            self.adjacency[u].add(v)
+            self.adjacency[v].add(u)
+            self.navigation.add_edge(u, v)
+            if self.kernel is not None:
+                self.kernel.edge_added(u, v)
+        self.frontier.observe(visible_state)
 
         # 2. Synchronize Colors with Game State
         for node, color in visible_state['node_colors'].items():
@@ -171,73 +271,252 @@ class B22CH032:
         return True, domains
     # 4. BACKTRACKING SEARCH (Fwd Check + Heuristics)
     def _backtrack_search_fwd_check(self, assignment, unassigned_nodes, domains):
-        """Recursive backtracking search with Forward Checking and Heuristics."""
-        
-        if not unassigned_nodes:
-            return assignment
-        
-        node = self._select_unassigned_variable(assignment, unassigned_nodes)
+        """Backtracking search with Forward Checking and Heuristics (unbudgeted)."""
+        state = _SearchState({}, assignment, set(unassigned_nodes), domains)
+        if self._run_search(state, _TurnBudget()) == _SOLVED:
+            return state.assignment
+        return None
 
-        # Get the ordered colors from the AC-3 pruned domains
-        domain_values = [c for c in self._order_domain_values(node, assignment, unassigned_nodes) 
-                         if c in domains[node]] 
+    def _run_search(self, state, budget):
+        """
+        Iterative depth-first search over ``state`` until it is solved, the tree is
+        exhausted, or ``budget`` runs out (the state is then left resumable).
+        """
+        assignment = state.assignment
+        unassigned = state.unassigned
+        stack = state.stack
 
-        for color in domain_values:
-            
-            # 1. Assignment and Consistency Check (Consistency is guaranteed by LCV/MRV)
+        while True:
+            if state.expand:
+                if not unassigned:
+                    return _SOLVED
+                if budget.exhausted():
+                    return _SUSPENDED
+                budget.nodes += 1
+                self.search_nodes_total += 1
+                node = self._select_unassigned_variable(assignment, unassigned)
+                # Get the ordered colors from the AC-3 pruned domains
+                domain = state.domains.get(node)
+                values = []
+                unused = []
+                for c in self._order_domain_values(node, assignment, unassigned):
+                    if domain is not None and c not in domain:
+                        continue
+                    # Symmetry breaking: colors no known node uses yet are interchangeable,
+                    # so only the first of them (in LCV order) is worth trying.
+                    if not state.color_use[c]:
+                        unused.append(c)
+                        if len(unused) > 1:
+                            continue
+                    values.append(c)
+                stack.append([node, values, 0, set(unused) if len(unused) > 1 else set()])
+                state.expand = False
+
+            if not stack:
+                return _EXHAUSTED
+
+            frame = stack[-1]
+            node, values, i = frame[0], frame[1], frame[2]
+            if assignment.get(node) is not None:
+                # Backtrack: the previous value of this frame failed below it
+                if state.at_best:
+                    state.best = [(f[0], assignment[f[0]]) for f in stack]
+                    state.at_best = False
+                state.color_use[assignment[node]] -= 1
+                assignment[node] = None
+                unassigned.add(node)
+
+            chosen = None
+            while i < len(values):
+                color = values[i]
+                i += 1
+                # Values of a resumed frame may have been invalidated by new edges
+                if color not in self._get_available_colors(node, assignment):
+                    continue
+                assignment[node] = color
+                # Forward Checking: no unassigned neighbor may lose its last color
+                if all(self._get_available_colors(neighbor, assignment)
+                       for neighbor in self.adjacency[node]
+                       if neighbor in unassigned and neighbor != node):
+                    chosen = color
+                    break
+                assignment[node] = None
+            frame[2] = i
+
+            if chosen is None:
+                stack.pop()
+                continue
+
+            unassigned.discard(node)
+            state.color_use[chosen] += 1
+            state.expand = True
+            if len(stack) > state.best_depth:
+                state.best_depth = len(stack)
+                state.at_best = True
+
+    def _resume_search(self, assignment, unassigned_vars, component, boundary):
+        """
+        Rebase the search suspended on an earlier turn onto ``component``.
+
+        Only valid when the new problem is at least as constrained as the old one
+        (same boundary colors plus more nodes, edges or fixed colors): values already
+        refuted in kept frames then stay refuted. Frames whose node became fixed to
+        the same color are dropped; the stack is cut at the first frame that no
+        longer fits, including frames whose symmetric color class is no longer
+        interchangeable because a newly fixed node uses one of its colors.
+        Returns None when the search has to start over.
+        """
+        old = self._search
+        if old is None or not any(f[0] in component for f in old.stack):
+            return None
+        self._search = None
+        if any(assignment.get(n) != c for n, c in old.root.items()):
+            return None
+        ac3_ok, domains = self._ac3_propagation(assignment, component)
+        if not ac3_ok:
+            return None
+
+        newly_fixed_colors = {c for n, c in boundary.items() if n not in old.root}
+        kept = []
+        for frame in old.stack:
+            node = frame[0]
+            color = old.assignment.get(node)
+            if color is None or frame[3] & newly_fixed_colors:
+                break
+            if node not in unassigned_vars:
+                if assignment.get(node) == color:
+                    continue
+                break
+            if node not in component:
+                break
+            if color not in self._get_available_colors(node, assignment):
+                break
             assignment[node] = color
-            new_unassigned = unassigned_nodes - {node}
-            # 2. Forward Checking: Check if any unassigned neighbor's domain is emptied
-            valid = True
-            for neighbor in self.adjacency[node]:
-                if neighbor in new_unassigned:
-                    if not self._get_available_colors(neighbor, assignment):
-                        valid = False
-                        break
-            
-            if valid:
-                # 3. Recurse
-                result = self._backtrack_search_fwd_check(assignment, new_unassigned, domains)
-                if result is not None:
-                    return result
-            
-            # 4. Backtrack
-            assignment[node] = None 
-            
-        return None
+            kept.append(frame)
+        if not kept:
+            return None
+
+        print(f"Planning: Resuming suspended search at depth {len(kept)}.")
+        state = _SearchState(boundary, assignment, component - {f[0] for f in kept}, domains)
+        state.stack = kept
+        return state
 
     # 5. GLOBAL PLANNING AND REPAIR
+    def _components(self, unassigned_vars):
+        """Connected components of the unassigned part of the known graph."""
+        seen = set()
+        components = []
+        for start in unassigned_vars:
+            if start in seen:
+                continue
+            seen.add(start)
+            component = {start}
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for neighbor in self.adjacency[node]:
+                    if neighbor in unassigned_vars and neighbor not in seen:
+                        seen.add(neighbor)
+                        component.add(neighbor)
+                        queue.append(neighbor)
+            components.append(component)
+        return components
+
+    def _solve_components(self, assignment, unassigned_vars, attempt, budget):
+        """
+        Solve each independent component of the unassigned nodes in ``assignment``,
+        reusing transposition-table entries. Returns (outcome, partial plan).
+        """
+        for component in self._components(unassigned_vars):
+            boundary = {n: assignment[n] for u in component for n in self.adjacency[u]
+                        if n not in component and assignment.get(n) is not None}
+            key = TranspositionTable.key(component, self.adjacency, boundary)
+            entry = self.transposition.get(key) if self.transposition is not None else None
+            if entry is not None:
+                solved, solution = entry
+                if not solved:
+                    return _EXHAUSTED, None
+                assignment.update(solution)
+                continue
+
+            state = None
+            if attempt == 0:
+                state = self._resume_search(assignment, unassigned_vars, component, boundary)
+            resumed = state is not None
+            if state is None:
+                # Step 1: Run AC-3 on the current state (prunes domains aggressively)
+                ac3_ok, domains = self._ac3_propagation(assignment, component)
+                if not ac3_ok:
+                    print("Planning: AC-3 detected an inevitable conflict early.")
+                    self._memoize(key, None)
+                    return _EXHAUSTED, None
+                state = _SearchState(boundary, assignment, set(component), domains)
+            # Step 2: Run the full search using the pruned domains
+            outcome = self._run_search(state, budget)
+            if outcome == _SOLVED:
+                self._memoize(key, {n: assignment[n] for n in component})
+            elif outcome == _EXHAUSTED:
+                # A resumed search relied on refutations made in the old, larger problem
+                if not resumed:
+                    self._memoize(key, None)
+                return _EXHAUSTED, None
+            else:
+                if state.at_best:
+                    state.best = [(f[0], assignment[f[0]]) for f in state.stack]
+                    state.at_best = False
+                self._search = state
+                return _SUSPENDED, state.best
+        return _SOLVED, None
+
+    def _memoize(self, key, solution):
+        if self.transposition is not None:
+            self.transposition.put(key, solution)
+
     def _plan_global_coloring(self):
         """Runs CSP with a repair strategy if the initial plan fails."""
         unassigned_vars = {n for n in self.all_nodes if n not in self.pre_colored and self.global_assignment.get(n) is None}
-        # Keep a copy of the assignment to modify during the repair process
-        assignment = self.global_assignment.copy()
+        self._partial_plan = {}
+        if self.planner is not None:
+            return self._plan_with_engine(unassigned_vars)
+        budget = _TurnBudget(self.node_budget, self.time_budget)
         # Retry loop for repair
         for attempt in range(2): 
+            # Keep a copy of the assignment to modify during the repair process
+            assignment = self.global_assignment.copy()
+            if attempt == 1:
+                assignment[node_to_clear] = None
             print(f"Planning: Starting attempt {attempt + 1}. Unassigned: {len(unassigned_vars)}")
-            # Step 1: Run AC-3 on the current state (prunes domains aggressively)
-            ac3_ok, domains = self._ac3_propagation(assignment, unassigned_vars)
-            
-            if not ac3_ok:
-                print("Planning: AC-3 detected an inevitable conflict early.")
-                if attempt == 0: 
-                    # If initial AC-3 fails, try repair by clearing a past assignment
-                    pass
-                else: 
-                    # Repair failed, state is impossible.
-                    return False
-            # Step 2: Run the full search using the pruned domains
-            result = self._backtrack_search_fwd_check(assignment.copy(), unassigned_vars, domains)
-            if result:
+            search_vars = unassigned_vars
+            if self.kernel is not None:
+                # Only the core needs searching; the rest is colored greedily on success
+                search_vars = set(self.kernel.update(unassigned_vars, assignment))
+                print(f"Planning: Kernel core {len(search_vars)}/{len(unassigned_vars)} nodes.")
+            outcome, partial = self._solve_components(assignment, search_vars, attempt, budget)
+            if outcome == _SOLVED:
                 # SUCCESS
-                self.global_assignment.update(result)
+                if self.kernel is not None:
+                    self.kernel.color_stripped(assignment, self.available_colors,
+                                               self._order_domain_values)
+                self._search = None
+                self.global_assignment.update(assignment)
                 print(f"Planning: Successfully updated global plan (Attempt {attempt+1}).")
                 return True
+            if outcome == _SUSPENDED:
+                # Budget exhausted: commit the solved components; the deepest partial
+                # plan of the suspended one is only used to act, and resumed next turn
+                suspended = self._search.unassigned | {f[0] for f in self._search.stack}
+                solved = {n: c for n, c in assignment.items()
+                          if n in unassigned_vars and n not in suspended and c is not None}
+                self.global_assignment.update(solved)
+                self._partial_plan = dict(partial)
+                print(f"Planning: Budget exhausted after {budget.nodes} nodes. Using partial plan "
+                      f"for {len(solved) + len(partial)}/{len(unassigned_vars)} nodes.")
+                return False
             # Step 3: REPAIR STRATEGY (If search failed on the first attempt)
             if attempt == 0:
                 print("Planning: Search failed. Attempting repair by clearing high-degree node...")
                 # Find the assigned, non-pre-colored node with the highest degree.
-                nodes_to_clear = [n for n in self.all_nodes if n not in self.pre_colored and assignment.get(n) is not None]
+                nodes_to_clear = [n for n in self.all_nodes if n not in self.pre_colored and self.global_assignment.get(n) is not None]
                 if not nodes_to_clear:
                     # Nothing to clear, no way to fix the conflict
                     return False
@@ -248,11 +527,24 @@ class B22CH032:
                 print(f"Planning: Clearing assignment of '{node_to_clear}' to enable repair.")
                 
                 # Clear its color and add it back to the unassigned set for the next attempt
-                assignment[node_to_clear] = None
                 unassigned_vars.add(node_to_clear)
             
         return False
 
+    def _plan_with_engine(self, unassigned_vars):
+        """Plan with the pluggable planner engine instead of AC-3 + backtracking."""
+        fixed = {n: c for n, c in self.global_assignment.items() if c is not None}
+        plan = self.planner.plan(self.adjacency, self.available_colors, fixed, unassigned_vars)
+        conflicts = self.planner.last_conflicts
+        if conflicts:
+            # Conflicting nodes stay unassigned (and get planned again), so their colors
+            # never become fixed constraints of later plans
+            plan = {n: c for n, c in plan.items()
+                    if all(plan.get(nb, fixed.get(nb)) != c for nb in self.adjacency[n])}
+        self.global_assignment.update(plan)
+        print(f"Planning: Engine planned {len(plan)} nodes with {conflicts} conflicts left.")
+        return conflicts == 0
+
     # 6. ACTION LOGIC
     def get_next_move(self, visible_state):
         """Intelligent movement heuristic."""
@@ -283,7 +575,17 @@ class B22CH032:
             target = min(uncolored_neighbors, key=move_priority)
             return {'action': 'move', 'node': target}
 
-        # 3. Navigate to closest uncolored node in known graph
+        # 3. Follow the tour over nodes not yet colored in the game (planned colors
+        #    do not count) and known nodes whose neighborhoods are unexplored
+        if self.router is not None:
+            tour = self.router.plan(self.current_position, self._route_targets())
+            if tour:
+                next_node = self.router.next_hop(self.current_position, tour[0])
+                if next_node in visible_nodes:
+                    self._route_target = tour[0]
+                    return {'action': 'move', 'node': next_node}
+
+        # 3b. Navigate to closest uncolored node in known graph
         if uncolored_nodes:
             # Prioritize the most constrained uncolored node in the *entire* known graph
             target = self._select_unassigned_variable(self.global_assignment, uncolored_nodes)
@@ -295,7 +597,12 @@ class B22CH032:
                 if next_node in visible_nodes: 
                     return {'action': 'move', 'node': next_node}
 
-        # 4. Explore a random visible neighbor to expand knowledge
+        # 4. Head for the frontier node with the best information gain per move
+        target, next_node = self.frontier.best_target(self.current_position)
+        if next_node in visible_nodes and next_node != self.current_position:
+            return {'action': 'move', 'node': next_node}
+
+        # 4b. Explore a random visible neighbor to expand knowledge
         visible_neighbors = [n for n in visible_nodes if n != self.current_position]
         if visible_neighbors:
             target = random.choice(visible_neighbors)
@@ -304,6 +611,54 @@ class B22CH032:
         # 5. Stay put (Fully colored or blocked)
         return {'action': 'move', 'node': self.current_position}
 
+    def _route_targets(self):
+        return (self.all_nodes - self.pre_colored.keys()) | self.frontier.frontier
+
+    def get_action_plan(self, visible_state):
+        """
+        Multi-step variant of ``get_next_move``: when the route runs through nodes
+        already colored in the game, return the walk along them as an action plan
+        (each step re-colors the node with its game color, which costs nothing).
+        Otherwise return the single move.
+        """
+        self._route_target = None
+        move = self.get_next_move(visible_state)
+        target, self._route_target = self._route_target, None
+        if target is None:
+            return move
+        # Walk the tour get_next_move just planned, through the colored nodes on the
+        # way. Stop at an uncolored node, or after a position whose observation would
+        # fully observe a frontier node (the tour targets change there).
+        tour = self.router.tour
+        steps = []
+        visited = set()
+        node, i = move['node'], 0
+        while node in self.pre_colored and node not in visited and len(steps) < 64:
+            visited.add(node)
+            steps.append(({'action': 'move', 'node': node},
+                          {'action': 'color', 'node': node, 'color': self.pre_colored[node]}))
+            if self.frontier.explored_from(node):
+                break
+            while i < len(tour) and tour[i] == node:
+                i += 1
+            node = self.router.next_hop(node, tour[i]) if i < len(tour) else None
+        if len(steps) < 2:
+            return move
+        # Hand control back when the walk reveals anything, or brings a node not yet
+        # colored in the game into view (its planned color is dropped on sight). Only
+        # known nodes within the visibility radius of the walk can come into view.
+        seen, ring = set(visited), visited
+        for _ in range(max(self.frontier.depth, 1)):
+            ring = {nb for n in ring for nb in self.adjacency[n]} - seen
+            seen |= ring
+        watch = [n for n in seen if n not in self.pre_colored]
+        return {'steps': steps, 'interrupt_on': ['new_nodes', 'new_edges'], 'watch': watch}
+
+    def plan_finished(self, observations, reason):
+        """Catch up on the observations made while an action plan ran."""
+        for visible_state in observations:
+            self._update_knowledge(visible_state)
+
     def get_color_for_node(self, node_to_color, visible_state):
         """Color node using the result of the continuous global planning."""
         self._update_knowledge(visible_state)
@@ -317,8 +672,13 @@ class B22CH032:
         if not self._plan_global_coloring():
             print("Agent: Global plan failed. Forced to use local heuristic.")
         
-        # 3. Use the result of the new consistent plan
+        # 3. Use the result of the new consistent plan (or of the suspended search's
+        #    partial plan, if it still fits)
         color = self.global_assignment.get(node_to_color)
+        if color is None:
+            color = self._partial_plan.get(node_to_color)
+            if color not in self._get_available_colors(node_to_color, self.global_assignment):
+                color = None
         
         if color is not None:
             # The color is derived from a consistent global plan
@@ -327,6 +687,11 @@ class B22CH032:
         # 4. Fallback (Should only happen if planning failed globally and 
         #    the node to color couldn't be assigned by the repair strategy)
         valid_colors = self._get_available_colors(node_to_color, self.global_assignment)
+        if valid_colors and self._partial_plan:
+            # Keep clear of the colors the suspended search planned for the neighbors
+            planned = {self._partial_plan.get(n) for n in self.adjacency[node_to_color]
+                       if self.global_assignment.get(n) is None}
+            valid_colors = [c for c in valid_colors if c not in planned] or valid_colors
             
         if valid_colors:
             # Use LCV on the remaining valid options as a safer fallback
@@ -344,23 +709,5 @@ class B22CH032:
 
     # 7. PATHFINDING HELPER    
     def _find_path(self, start, goal):
-        """BFS to find shortest path in the known graph."""
-        if start == goal:
-            return [start]
-        
-        queue = deque([(start, [start])])
-        visited = {start}
-        
-        while queue:
-            current, path = queue.popleft()
-            
-            for neighbor in self.adjacency[current]:
-                if neighbor not in visited:
-                    new_path = path + [neighbor]
-                    if neighbor == goal:
-                        return new_path
-                    
-                    visited.add(neighbor)
-                    queue.append((neighbor, new_path))
-        
-        return None
\ No newline at end of file
+        """Shortest path in the known graph, from the cached shortest-path tree of goal."""
+        return self.navigation.path(start, goal)
@@ -454,6 +454,12 @@
 from collections import defaultdict, deque
 import random
 
+from frontier import FrontierIndex
+from known_graph import KnownGraph
+from navigation import NavigationIndex
+from planners import make_planner
+from routing import TourPlanner
+
 class B22EE088:
     """
     Fixed CSP agent for partial-observability graph coloring.
@@ -462,102 +468,135 @@ class B22EE088:
     - BFS movement to nearest uncolored node
     - Avoid cycles using recent_nodes memory
     - Forward checking on all known neighbors
+    - Optional planner engine (``planner=`` a planner object, "min_conflicts", "tabu" or "portfolio")
+      that colors from a plan of the whole known graph
+    - Route planning (``route_planning=True``): once no uncolored node is visible,
+      follow a short tour over known uncolored (first) and unexplored nodes
+    - Exploration heads for the frontier node with the best information gain
+      instead of a random neighbor
+    - Known graph kept in a ``KnownGraph``, whose per-node counts of neighbor colors
+      make consistency and domain checks O(1) per color and forward checking O(degree)
     """
-    def __init__(self, initial_state):
-        # Initialize known graph
-        self.known_nodes = set(initial_state['visible_graph']['nodes'])
-        self.known_edges = set()
-        self.adjacency = defaultdict(set)
-        for edge in initial_state['visible_graph']['edges']:
-            u, v = edge
-            et = tuple(sorted((u, v)))
-            self.known_edges.add(et)
-            self.adjacency[u].add(v)
-            self.adjacency[v].add(u)
-
+    def __init__(self, initial_state, planner=None, route_planning=True):
         # Colors & assignments
         self.available_colors = list(initial_state.get('available_colors', initial_state.get('colors', ["Red","Green","Blue"])))
-        self.node_colors = dict(initial_state.get('node_colors', {}))
+        self.node_colors = {}
+        self.uncolored_nodes = set()
+
+        # Known graph: edges and neighbor color counts live in self.graph; the name-keyed
+        # adjacency below is fed from its merges and shared with the indexes
+        self.graph = KnownGraph(self.available_colors)
+        self.adjacency = defaultdict(set)
+        self.navigation = NavigationIndex(self.adjacency)
+        self._merge(initial_state)
         for n, c in initial_state.get('pre_colored', {}).items():
-            self.node_colors[n] = c
+            self.record_color(n, c)
 
         # Agent state
-        self.current_node = initial_state['current_node']
         self.visited_nodes = set([self.current_node])
-        self.uncolored_nodes = {n for n in self.known_nodes if self.node_colors.get(n) is None}
 
         # Movement memory to avoid cycles
         self.recent_nodes = deque(maxlen=10)
 
+        # Optional planner engine; its last plan warm-starts the next one
+        self.planner = make_planner(planner)
+        self.planned_colors = {}
+        self.router = TourPlanner(self.navigation) if route_planning else None
+        self.frontier = FrontierIndex(self.adjacency)
+        self.frontier.observe(initial_state)
+
         print("CSP_AGENT initialized. start:", self.current_node)
 
     # -----------------------------
     # Knowledge update
     # -----------------------------
     def update_knowledge(self, visible_state):
-        for n in visible_state['visible_graph']['nodes']:
-            if n not in self.known_nodes:
-                self.known_nodes.add(n)
-                _ = self.adjacency[n]
-        for edge in visible_state['visible_graph']['edges']:
-            u, v = edge
-            et = tuple(sorted((u, v)))
-            if et not in self.known_edges:
-                self.known_edges.add(et)
-                self.adjacency[u].add(v)
-                self.adjacency[v].add(u)
-        for n, c in visible_state.get('node_colors', {}).items():
-            if c is not None:
-                self.node_colors[n] = c
-        self.current_node = visible_state['current_node']
+        """Merge an observation; costs O(size of the observation), not of the known graph."""
+        self._merge(visible_state)
         self.visited_nodes.add(self.current_node)
-        self.uncolored_nodes = {n for n in self.known_nodes if self.node_colors.get(n) is None}
+        self.frontier.observe(visible_state)
+
+    def _merge(self, visible_state):
+        """Merge into self.graph and pass what it reports as new on to the adjacency."""
+        graph = self.graph
+        names = graph.names
+        adjacency = self.adjacency
+        result = graph.merge(visible_state)
+        for i in result.new_nodes:
+            _ = adjacency[names[i]]
+            self.uncolored_nodes.add(names[i])
+        for a, b in result.new_edges:
+            u, v = names[a], names[b]
+            adjacency[u].add(v)
+            adjacency[v].add(u)
+            self.navigation.add_edge(u, v)
+        for i in result.recolored:
+            self.node_colors[names[i]] = graph.colors[graph.color[i]]
+            self.uncolored_nodes.discard(names[i])
+        self.current_node = visible_state['current_node']
+
+    def record_color(self, node, color):
+        """Set node's color and update its neighbors' counts (O(degree))."""
+        self.node_colors[node] = color
+        self.uncolored_nodes.discard(node)
+        self.graph.set_color(self.graph.intern(node), self.graph.color_id(color))
 
     # -----------------------------
     # Domain & heuristics
     # -----------------------------
     def get_domain(self, node):
-        if node not in self.known_nodes:
+        if node not in self.graph:
             return list(self.available_colors)
         if self.node_colors.get(node) is not None:
             return [self.node_colors[node]]
-        forbidden = {self.node_colors[n] for n in self.adjacency[node] if self.node_colors.get(n) is not None}
-        return [c for c in self.available_colors if c not in forbidden]
+        return self.graph.domain(node)
 
     def is_consistent(self, node, color):
-        return all(self.node_colors.get(nb) != color for nb in self.adjacency[node])
+        return node not in self.graph or self.graph.count(node, color) == 0
 
     def forward_checking_simulate(self, node, color):
         """Check all neighbors have at least one color left."""
+        graph = self.graph
+        counted = color in self.available_colors
         for nb in self.adjacency[node]:
             if self.node_colors.get(nb) is None:
-                dom = [c for c in self.available_colors if c != color and self.is_consistent(nb, c)]
-                if not dom:
+                left = graph.free_count(nb)
+                if counted and graph.count(nb, color) == 0:
+                    left -= 1
+                if left <= 0:
                     return False
         return True
 
+    def plan_color(self, node):
+        """Color for node from a planner-engine plan of all known uncolored nodes."""
+        fixed = {n: c for n, c in self.node_colors.items() if c is not None}
+        variables = self.uncolored_nodes | {node}
+        self.planned_colors = self.planner.plan(self.adjacency, self.available_colors, fixed,
+                                                variables, warm_start=self.planned_colors)
+        return self.planned_colors.get(node)
+
     # -----------------------------
     # Movement: BFS to nearest uncolored visible node
     # -----------------------------
     def find_next_step_to_nearest_uncolored(self, visible_state):
         visible_nodes = set(visible_state['visible_graph']['nodes'])
-        dests = [n for n in visible_nodes if self.node_colors.get(n) is None]
+        dests = {n for n in visible_nodes if self.node_colors.get(n) is None}
         if not dests:
             return None
-        start = self.current_node
-        queue = deque([(start, [start])])
-        seen = {start}
-        while queue:
-            node, path = queue.popleft()
-            if node in dests:
-                return path[1] if len(path) >= 2 else node
-            for nb in self.adjacency[node]:
-                if nb not in seen and nb in visible_nodes:
-                    seen.add(nb)
-                    queue.append((nb, path + [nb]))
+        target, next_step = self.navigation.nearest(self.current_node, dests, allowed=visible_nodes)
+        if target is not None:
+            return next_step
         dests_sorted = sorted(dests, key=lambda n: (len(self.get_domain(n)), -sum(1 for nb in self.adjacency[n] if self.node_colors.get(nb) is None)))
         return dests_sorted[0]
 
+    def next_step_on_tour(self):
+        """Next hop along the planned tour over uncolored and unvisited known nodes."""
+        targets = self.uncolored_nodes | self.frontier.frontier
+        tour = self.router.plan(self.current_node, targets, preferred=self.uncolored_nodes)
+        if not tour:
+            return None
+        return self.router.next_hop(self.current_node, tour[0])
+
     # -----------------------------
     # Move action
     # -----------------------------
@@ -570,13 +609,26 @@ class B22EE088:
         if self.node_colors.get(current) is None:
             return {'action': 'move', 'node': current}
 
-        # Move towards nearest uncolored node
+        # Move towards nearest uncolored visible node
         next_step = self.find_next_step_to_nearest_uncolored(visible_state)
         if next_step:
             self.current_node = next_step
             return {'action': 'move', 'node': next_step}
 
-        # Explore: pick colored neighbor not in recent_nodes
+        # Follow the tour over uncolored and unexplored known nodes
+        if self.router is not None:
+            next_step = self.next_step_on_tour()
+            if next_step:
+                self.current_node = next_step
+                return {'action': 'move', 'node': next_step}
+
+        # Explore: head for the most informative frontier node
+        target, next_step = self.frontier.best_target(current)
+        if next_step is not None and next_step != current:
+            self.current_node = next_step
+            return {'action': 'move', 'node': next_step}
+
+        # Last resort: pick colored neighbor not in recent_nodes
         neighbors = [n for n in self.adjacency[current] if n != current]
         unvisited = [n for n in neighbors if n not in self.recent_nodes]
         if unvisited:
@@ -595,17 +647,22 @@ class B22EE088:
         self.update_knowledge(visible_state)
         domain = self.get_domain(node_to_color)
 
-        # Safe color choice
+        # Planned color, else safe color choice
         best_color = None
-        for color in domain:
-            if self.is_consistent(node_to_color, color) and self.forward_checking_simulate(node_to_color, color):
-                best_color = color
-                break
+        if self.planner is not None and self.node_colors.get(node_to_color) is None:
+            best_color = self.plan_color(node_to_color)
+            # A plan with conflicts left may clash with a colored neighbor
+            if best_color is not None and not self.is_consistent(node_to_color, best_color):
+                best_color = None
+        if best_color is None:
+            for color in domain:
+                if self.is_consistent(node_to_color, color) and self.forward_checking_simulate(node_to_color, color):
+                    best_color = color
+                    break
         if best_color is None:
             best_color = domain[0] if domain else self.available_colors[0]
 
         # Assign color
-        self.node_colors[node_to_color] = best_color
+        self.record_color(node_to_color, best_color)
         self.visited_nodes.add(node_to_color)
-        self.uncolored_nodes.discard(node_to_color)
         return {'action': 'color', 'node': node_to_color, 'color': best_color}
@@ -0,0 +1,103 @@
+"""
+Lazy registry of agent classes.
+
+Agents are discovered without importing them, from two sources:
+
+- Modules next to the runner (or in ``search_paths``) named like a roll number,
+  e.g. ``B22CH032.py``, plus ``student_template.py``. The agent class is the one
+  named after the module, falling back to ``CSP_AGENT`` (the template's name).
+- The ``colour_me.agents`` entry point group of installed packages, e.g.
+  ``[project.entry-points."colour_me.agents"] B22XY001 = "my_agent:MyAgent"``.
+
+A module is imported only when its agent is first requested, so a worker that
+runs one agent never pays for importing the others.
+
+    registry = AgentRegistry()
+    registry.match(["B22*"])          # ['B22CH032', 'B22EE088']
+    agent_class = registry.get("B22CH032")
+"""
+import fnmatch
+import importlib
+import os
+import re
+
+ROLL_NUMBER = re.compile(r"^[A-Z]\d{2}[A-Z]{2}\d{3}$")
+TEMPLATE_MODULES = ("student_template",)
+ENTRY_POINT_GROUP = "colour_me.agents"
+FALLBACK_CLASS = "CSP_AGENT"
+
+
+class AgentRegistry:
+    """Name -> agent class, discovered by file name or entry point, imported on first use."""
+    def __init__(self, search_paths=None, entry_point_group=ENTRY_POINT_GROUP):
+        self.search_paths = list(search_paths or [os.path.dirname(os.path.abspath(__file__))])
+        self.entry_point_group = entry_point_group
+        self._specs = None      # name -> "module" or "module:Class" or EntryPoint
+        self._loaded = {}
+
+    def _discover(self):
+        specs = {}
+        for path in self.search_paths:
+            if not os.path.isdir(path):
+                continue
+            for filename in sorted(os.listdir(path)):
+                name, ext = os.path.splitext(filename)
+                if ext == ".py" and (ROLL_NUMBER.match(name) or name in TEMPLATE_MODULES):
+                    specs.setdefault(name, name)
+        if self.entry_point_group:
+            from importlib import metadata  # slow to import; only needed for discovery
+            for ep in metadata.entry_points(group=self.entry_point_group):
+                specs.setdefault(ep.name, ep)
+        return specs
+
+    @property
+    def specs(self):
+        if self._specs is None:
+            self._specs = self._discover()
+        return self._specs
+
+    def names(self):
+        return sorted(self.specs)
+
+    def register(self, name, target):
+        """Add an agent by class or "module[:Class]" string, overriding discovery."""
+        if isinstance(target, str):
+            self.specs[name] = target
+            self._loaded.pop(name, None)
+        else:
+            self.specs[name] = target
+            self._loaded[name] = target
+
+    def match(self, patterns):
+        """Registered names matching any of the glob ``patterns``, in sorted order."""
+        return [n for n in self.names() if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+
+    def get(self, name):
+        """The agent class for ``name``, importing its module on first use."""
+        if name in self._loaded:
+            return self._loaded[name]
+        spec = self.specs.get(name, name if ":" in name else None)
+        if spec is None:
+            raise KeyError(f"Unknown agent '{name}'. Known agents: {', '.join(self.names())}")
+        agent_class = self._load(name, spec)
+        self._loaded[name] = agent_class
+        return agent_class
+
+    @staticmethod
+    def _load(name, spec):
+        if isinstance(spec, str):
+            module_name, _, class_name = spec.partition(":")
+            module = importlib.import_module(module_name)
+            if class_name:
+                return getattr(module, class_name)
+            for candidate in (module_name, name, FALLBACK_CLASS):
+                if hasattr(module, candidate):
+                    return getattr(module, candidate)
+            raise AttributeError(f"Module '{module_name}' defines no agent class "
+                                 f"'{module_name}' or '{FALLBACK_CLASS}'.")
+        if hasattr(spec, "load"):  # importlib.metadata.EntryPoint
+            return spec.load()
+        return spec
+
+
+default_registry = AgentRegistry()
@@ -0,0 +1,104 @@
+"""
+Memoized k-hop neighborhoods ("balls") for the game engine.
+
+``GraphColoringGame.get_visible_state`` runs a radius-bounded BFS on every call,
+twice per turn. The ball around a node never changes during a game (only colors
+do), so it can be computed once and reused. Each ball is stored compactly as a
+tuple of node names and a flat tuple of edge endpoints ``(u0, v0, u1, v1, ...)``;
+names are shared with the level, so a ball costs about one pointer per node and
+two per edge. Balls are kept in LRU order and evicted once their estimated size
+exceeds ``max_bytes``.
+
+    cache = BallCache(game.adj, game.visibility_radius, max_bytes=64 << 20)
+    nodes, flat_edges = cache.get('V3')
+"""
+import sys
+from collections import OrderedDict, deque
+
+
+def compute_ball(adj, center, radius):
+    """
+    Nodes within ``radius`` hops of ``center`` and the edges the engine reveals,
+    as (list of nodes, list of sorted (u, v) tuples), in the engine's order.
+    """
+    queue = deque([(center, 0)])
+    visited_bfs = {center}
+    visible_nodes = {center}
+    visible_edges = set()
+
+    while queue:
+        node, distance = queue.popleft()
+        if distance >= radius:
+            continue
+
+        for neighbor in adj[node]:
+            visible_edges.add(tuple(sorted((node, neighbor))))
+            if neighbor not in visited_bfs:
+                visited_bfs.add(neighbor)
+                visible_nodes.add(neighbor)
+                queue.append((neighbor, distance + 1))
+
+    edges = [e for e in visible_edges if e[0] in visible_nodes and e[1] in visible_nodes]
+    return list(visible_nodes), edges
+
+
+class BallCache:
+    """LRU cache of k-hop balls with an approximate memory cap in bytes."""
+    def __init__(self, adj, radius, max_bytes=64 << 20):
+        self.adj = adj
+        self.radius = radius
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._balls = OrderedDict()  # center -> (nodes tuple, flat edge tuple, size)
+
+    def __len__(self):
+        return len(self._balls)
+
+    def get(self, center):
+        """(nodes, flat_edges) of the ball around ``center``, computing it on a miss."""
+        entry = self._balls.get(center)
+        if entry is not None:
+            self._balls.move_to_end(center)
+            self.hits += 1
+            return entry[0], entry[1]
+        self.misses += 1
+        nodes, edges = compute_ball(self.adj, center, self.radius)
+        nodes = tuple(nodes)
+        flat = tuple(x for e in edges for x in e)
+        self._store(center, nodes, flat)
+        return nodes, flat
+
+    def precompute(self, centers):
+        """Fill the cache with the balls around ``centers`` until the memory cap is hit."""
+        for center in centers:
+            if center in self._balls:
+                continue
+            nodes, edges = compute_ball(self.adj, center, self.radius)
+            nodes = tuple(nodes)
+            flat = tuple(x for e in edges for x in e)
+            if self.bytes + self._size(nodes, flat) > self.max_bytes:
+                break
+            self._store(center, nodes, flat)
+        return len(self._balls)
+
+    def stats(self):
+        return {"entries": len(self._balls), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+    @staticmethod
+    def _size(nodes, flat):
+        return sys.getsizeof(nodes) + sys.getsizeof(flat) + 64  # + key and entry tuple
+
+    def _store(self, center, nodes, flat):
+        size = self._size(nodes, flat)
+        if size > self.max_bytes:
+            return
+        self._balls[center] = (nodes, flat, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, _, old) = self._balls.popitem(last=False)
+            self.bytes -= old
+            self.evictions += 1
@@ -0,0 +1,78 @@
+"""
+Benchmark: the per-step protocol against multi-step action plans.
+
+Each level is played twice by the same agent with the same seed, once with
+``action_plans=False`` (one ``get_next_move`` and one ``get_color_for_node``
+call per step) and once with plans enabled. Reported per mode: score, moves,
+agent calls, observations built by the engine, the share of steps executed from
+a submitted plan, and wall time.
+
+    python bench_action_plans.py --nodes 300 --radius 2 --agent B22CH032
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from agent_registry import default_registry
+from game_runner import GameRunner
+from level_generator import generate_level, write_level
+
+
+def _counting(obj, name, counts, key):
+    original = getattr(obj, name)
+
+    def counted(*args, **kwargs):
+        counts[key] += 1
+        return original(*args, **kwargs)
+    setattr(obj, name, counted)
+
+
+def play(level_file, agent_class, action_plans, seed=0):
+    """(summary, counts, seconds) for one game."""
+    random.seed(seed)
+    counts = {"agent_calls": 0, "observations": 0, "planned_steps": 0}
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = GameRunner(level_file, agent_class, action_plans=action_plans)
+        _counting(runner.game, "get_visible_state", counts, "observations")
+        # Only the entry points the referee calls (get_action_plan may call get_next_move)
+        entry = ("get_action_plan", "plan_finished") if runner.action_plans else ("get_next_move",)
+        for name in entry + ("get_color_for_node",):
+            if hasattr(runner.agent, name):
+                _counting(runner.agent, name, counts, "agent_calls")
+        _counting(runner, "_run_plan_step", counts, "planned_steps")
+        start = time.perf_counter()
+        summary = runner.run_game()
+        elapsed = time.perf_counter() - start
+    return summary, counts, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=300)
+    parser.add_argument("--degree", type=float, default=3.0)
+    parser.add_argument("--radius", type=int, default=2)
+    parser.add_argument("--agent", default="B22CH032")
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    agent_class = default_registry.get(args.agent)
+    print(f"{'seed':>4} {'mode':>9} {'score':>7} {'moves':>6} {'calls':>6} "
+          f"{'observ.':>8} {'planned':>8} {'seconds':>8}")
+    for seed in range(args.seeds):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            write_level(generate_level(args.nodes, args.degree, visibility_radius=args.radius,
+                                       seed=seed), path)
+            for plans in (False, True):
+                summary, counts, elapsed = play(path, agent_class, plans, seed)
+                share = counts["planned_steps"] / max(1, summary["moves"])
+                print(f"{seed:>4} {'plans' if plans else 'per-step':>9} {summary['score']:>7} "
+                      f"{summary['moves']:>6} {counts['agent_calls']:>6} "
+                      f"{counts['observations']:>8} {share:>8.0%} {elapsed:>8.2f}")
+        finally:
+            os.remove(path)
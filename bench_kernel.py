@@ -0,0 +1,69 @@
+"""
+Benchmark: B22CH032's global planning with and without low-degree kernelization.
+
+Each generated level is played twice with the same seed, ``kernelize=False`` and
+``kernelize=True``. Reported per level: the mean fraction of the unassigned nodes
+left in the kernel's core, search nodes expanded, total time spent in
+``_plan_global_coloring`` and the final score of each run.
+
+    python bench_kernel.py --nodes 200 --degree 3 --levels 5
+"""
+import argparse
+import contextlib
+import functools
+import io
+import os
+import random
+import tempfile
+import time
+
+from B22CH032 import B22CH032
+from game_runner import GameRunner
+from level_generator import generate_level, write_level
+
+
+def play(level_file, kernelize, seed=0):
+    """(summary, agent, seconds spent planning) for one game."""
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = GameRunner(level_file, functools.partial(B22CH032, kernelize=kernelize))
+        agent = runner.agent
+        plan = agent._plan_global_coloring
+        spent = [0.0]
+
+        def timed():
+            start = time.perf_counter()
+            try:
+                return plan()
+            finally:
+                spent[0] += time.perf_counter() - start
+        agent._plan_global_coloring = timed
+        summary = runner.run_game()
+    return summary, agent, spent[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--degree", type=float, default=3.0)
+    parser.add_argument("--colors", type=int, default=3)
+    parser.add_argument("--radius", type=int, default=1)
+    parser.add_argument("--levels", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'level':>5} {'core':>6} {'nodes off':>10} {'nodes on':>9} {'plan s off':>11} "
+          f"{'plan s on':>10} {'score off':>10} {'score on':>9}")
+    for seed in range(args.levels):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            write_level(generate_level(args.nodes, args.degree, args.colors, args.radius,
+                                       seed=seed), path)
+            off, plain, off_s = play(path, False, seed)
+            on, kernelized, on_s = play(path, True, seed)
+        finally:
+            os.remove(path)
+        core = kernelized.kernel.stats()["mean_core_fraction"]
+        print(f"{seed:>5} {core:>6.1%} {plain.search_nodes_total:>10} "
+              f"{kernelized.search_nodes_total:>9} {off_s:>11.3f} {on_s:>10.3f} "
+              f"{off['score']:>10} {on['score']:>9}")
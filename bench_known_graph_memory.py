@@ -0,0 +1,108 @@
+"""
+Benchmark: memory per known node of KnownGraph versus the agents' old dict/set layout.
+
+Both knowledge bases are built from the same stream of engine observations (the
+agent teleported along a BFS order of a generated level) and measured with
+tracemalloc. The dict/set layout is the one B22CH032 and B22EE088 kept before
+they merged through KnownGraph: a set of node names, a set of sorted edge
+tuples, a defaultdict(set) adjacency and a color dict. The agents themselves are
+measured on the same stream too, with everything their merge maintains (the
+shared adjacency, navigation, frontier and kernel indexes).
+
+    python bench_known_graph_memory.py --nodes 100000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import tracemalloc
+from collections import defaultdict
+
+from B22CH032 import B22CH032
+from B22EE088 import B22EE088
+from bench_update_knowledge import bfs_order
+from game_engine import GraphColoringGame
+from known_graph import KnownGraph
+from level_generator import generate_level, write_level
+
+
+class _DictSetKnowledge:
+    """The agents' memory layout before KnownGraph."""
+    def __init__(self):
+        self.known_nodes = set()
+        self.known_edges = set()
+        self.adjacency = defaultdict(set)
+        self.node_colors = {}
+
+    def merge(self, visible_state):
+        for n in visible_state['visible_graph']['nodes']:
+            if n not in self.known_nodes:
+                self.known_nodes.add(n)
+                _ = self.adjacency[n]
+                self.node_colors[n] = None
+        for u, v in visible_state['visible_graph']['edges']:
+            et = tuple(sorted((u, v)))
+            if et not in self.known_edges:
+                self.known_edges.add(et)
+                self.adjacency[u].add(v)
+                self.adjacency[v].add(u)
+        for n, c in visible_state['node_colors'].items():
+            if c is not None:
+                self.node_colors[n] = c
+
+
+class _Agent:
+    """An agent's knowledge merge behind the ``merge`` interface."""
+    def __init__(self, agent_class, merge_name):
+        self.agent_class, self.merge_name, self.agent = agent_class, merge_name, None
+
+    def merge(self, visible_state):
+        if self.agent is None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.agent = self.agent_class(visible_state)
+        else:
+            getattr(self.agent, self.merge_name)(visible_state)
+
+
+def measure(factory, states):
+    """Bytes held by the knowledge base after merging every state."""
+    gc.collect()
+    tracemalloc.start()
+    kb = factory()
+    for state in states:
+        kb.merge(state)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, kb
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--degree", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        write_level(generate_level(args.nodes, args.degree, seed=args.seed), path)
+        game = GraphColoringGame(path)
+    finally:
+        os.remove(path)
+
+    states = []
+    for node in bfs_order(game):
+        game.current_node = node
+        states.append(game.get_visible_state())
+
+    print(f"{'layout':>10} {'bytes/node':>11} {'peak bytes/node':>16}")
+    for name, factory in (("dict/set", _DictSetKnowledge),
+                          ("KnownGraph", lambda: KnownGraph(game.colors)),
+                          ("B22CH032", lambda: _Agent(B22CH032, "_update_knowledge")),
+                          ("B22EE088", lambda: _Agent(B22EE088, "update_knowledge"))):
+        current, peak, kb = measure(factory, states)
+        print(f"{name:>10} {current / args.nodes:>11.1f} {peak / args.nodes:>16.1f}")
+        del kb
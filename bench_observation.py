@@ -0,0 +1,99 @@
+"""
+Benchmark: allocations per step of GraphColoringGame.get_visible_state in the
+"copy", "view" and "ids" observation modes, measured with tracemalloc, and the
+time B22EE088.update_knowledge takes to merge each mode's observations.
+
+A step takes two observations, as GameRunner.run_game does (before the move and
+after it). The observations of a random walk are kept alive while tracing so
+every block they allocate shows up in the snapshot difference; per-step block
+counts and bytes are averaged over the walk, after a warm-up pass in which view
+mode builds its per-node views (and "ids" mode its encoded balls).
+
+    python bench_observation.py --nodes 2000 --radius 2 --degree 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from B22EE088 import B22EE088
+from bench_visibility import random_walk
+from game_engine import GraphColoringGame
+from level_generator import generate_level, write_level
+
+
+def observe_walk(game, walk):
+    kept = []
+    for node in walk:
+        kept.append(game.get_visible_state())
+        game.current_node = node
+        kept.append(game.get_visible_state())
+    return kept
+
+
+def measure(game, walk):
+    """(blocks per step, bytes per step, microseconds per step) over ``walk``."""
+    observe_walk(game, walk)  # warm-up
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = observe_walk(game, walk)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    blocks = sum(max(s.count_diff, 0) for s in diff)
+    size = sum(max(s.size_diff, 0) for s in diff)
+    del kept
+
+    start = time.perf_counter()
+    observe_walk(game, walk)
+    elapsed = time.perf_counter() - start
+    return blocks / len(walk), size / len(walk), elapsed / len(walk) * 1e6
+
+
+def measure_agent(game, walk):
+    """Microseconds per B22EE088.update_knowledge call on the observations of ``walk``."""
+    game.current_node = game.start_node
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = B22EE088(game.get_visible_state())
+    elapsed = 0.0
+    for node in walk:
+        game.current_node = node
+        state = game.get_visible_state()
+        start = time.perf_counter()
+        agent.update_knowledge(state)
+        elapsed += time.perf_counter() - start
+    return elapsed / len(walk) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--degree", type=float, default=4.0)
+    parser.add_argument("--radius", type=int, default=2)
+    parser.add_argument("--walk", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        write_level(generate_level(args.nodes, args.degree, visibility_radius=args.radius,
+                                   seed=args.seed), path)
+        modes = {
+            "copy": GraphColoringGame(path),
+            "view": GraphColoringGame(path, observation_mode="view"),
+            "ids": GraphColoringGame(path, observation_mode="ids"),
+        }
+    finally:
+        os.remove(path)
+
+    walk = random_walk(modes["copy"], args.walk, args.seed)
+    print(f"{'mode':>6} {'blocks/step':>12} {'bytes/step':>12} {'us/step':>9} {'agent us/step':>14}")
+    for name, game in modes.items():
+        game.current_node = game.start_node
+        blocks, size, us = measure(game, walk)
+        agent_us = measure_agent(game, walk)
+        print(f"{name:>6} {blocks:>12.1f} {size:>12.0f} {us:>9.1f} {agent_us:>14.1f}")
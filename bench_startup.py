@@ -0,0 +1,45 @@
+"""
+Benchmark: startup cost of the runner measured with ``python -X importtime``.
+
+Compares importing ``game_runner`` alone (agents load lazily through the
+registry) with importing it plus every registered agent, which is what each
+worker process paid when the runner imported all agents at module load.
+
+    python bench_startup.py --repeat 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+from agent_registry import default_registry
+
+
+def import_time_us(statement, module):
+    """Cumulative import time of ``module`` (microseconds) while running ``statement``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() in module:
+            total += int(parts[1])
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    agents = [spec for spec in default_registry.specs.values() if isinstance(spec, str)]
+    cases = {
+        "game_runner (lazy agents)": ("import game_runner", {"game_runner"}),
+        "game_runner + all agents": ("import game_runner, " + ", ".join(agents),
+                                     {"game_runner", *agents}),
+    }
+    print(f"{'case':<28} {'median import us':>17}")
+    for label, (statement, modules) in cases.items():
+        samples = [import_time_us(statement, modules) for _ in range(args.repeat)]
+        print(f"{label:<28} {statistics.median(samples):>17.0f}")
@@ -0,0 +1,100 @@
+"""
+Benchmark: cost of one B22EE088.update_knowledge call as the known graph grows.
+
+The agent is fed the engine's own observations while it is teleported along a
+BFS order of a generated level, so the known graph grows to the whole level.
+For comparison the old merge (rebuilding the uncolored set from every known
+node and sorting every visible edge) is replayed on the same stream up to
+``--baseline-limit`` known nodes.
+
+    python bench_update_knowledge.py --nodes 100000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from collections import deque
+
+from B22EE088 import B22EE088
+from game_engine import GraphColoringGame
+from level_generator import generate_level, write_level
+
+
+class _RebuildingAgent(B22EE088):
+    """B22EE088 with the previous, O(known graph) knowledge merge."""
+    def update_knowledge(self, visible_state):
+        known_edges = set()
+        for edge in visible_state['visible_graph']['edges']:
+            u, v = edge
+            known_edges.add(tuple(sorted((u, v))))
+        self._merge(visible_state)
+        self.visited_nodes.add(self.current_node)
+        self.uncolored_nodes = {n for n in self.graph.names if self.node_colors.get(n) is None}
+
+
+def bfs_order(game):
+    """BFS order of the level from its start node."""
+    order, seen = [], {game.start_node}
+    queue = deque([game.start_node])
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for nb in game.adj[node]:
+            if nb not in seen:
+                seen.add(nb)
+                queue.append(nb)
+    return order
+
+
+def measure(agent_class, game, order, checkpoints, limit=None):
+    """Mean microseconds per update_knowledge call around each known-graph size."""
+    game.current_node = order[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = agent_class(game.get_visible_state())
+    results = {}
+    pending = list(checkpoints)
+    window, elapsed = 0, 0.0
+    for node in order[1:]:
+        if not pending or (limit is not None and len(agent.graph) > limit):
+            break
+        game.current_node = node
+        state = game.get_visible_state()
+        start = time.perf_counter()
+        agent.update_knowledge(state)
+        elapsed += time.perf_counter() - start
+        window += 1
+        if len(agent.graph) >= pending[0]:
+            results[pending.pop(0)] = elapsed / window * 1e6
+            window, elapsed = 0, 0.0
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--degree", type=float, default=4.0)
+    parser.add_argument("--radius", type=int, default=1)
+    parser.add_argument("--baseline-limit", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        write_level(generate_level(args.nodes, args.degree, visibility_radius=args.radius,
+                                   seed=args.seed), path)
+        game = GraphColoringGame(path)
+    finally:
+        os.remove(path)
+    order = bfs_order(game)
+    checkpoints = [n for n in (100, 1000, 10000, 100000, 1000000) if n <= args.nodes]
+
+    incremental = measure(B22EE088, game, order, checkpoints)
+    baseline = measure(_RebuildingAgent, game, order, checkpoints, args.baseline_limit)
+    print(f"{'known nodes':>12} {'incremental us/call':>20} {'rebuild us/call':>16}")
+    for n in checkpoints:
+        old = baseline.get(n)
+        print(f"{n:>12} {incremental.get(n, float('nan')):>20.1f} "
+              f"{old if old is not None else float('nan'):>16.1f}")
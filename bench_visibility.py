@@ -0,0 +1,70 @@
+"""
+Benchmark: latency of GraphColoringGame.get_visible_state versus visibility
+radius and average degree, with and without the k-hop ball cache.
+
+For each (radius, degree) a level is generated and observations are taken along
+a random walk, so nodes are revisited as they are during a game. The cached
+engine is measured after one warm-up pass over the same walk.
+
+    python bench_visibility.py --nodes 5000 --radii 1 2 3 4 --degrees 3 6 10
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from game_engine import GraphColoringGame
+from level_generator import generate_level, write_level
+
+
+def random_walk(game, length, seed=0):
+    rng = random.Random(seed)
+    walk, node = [], game.start_node
+    for _ in range(length):
+        walk.append(node)
+        node = rng.choice(game.adj[node])
+    return walk
+
+
+def measure(game, walk):
+    """Mean microseconds per get_visible_state call and mean visible-ball size."""
+    visible = 0
+    start = time.perf_counter()
+    for node in walk:
+        game.current_node = node
+        visible += len(game.get_visible_state()['visible_graph']['nodes'])
+    return (time.perf_counter() - start) / len(walk) * 1e6, visible / len(walk)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--radii", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--degrees", type=float, nargs="+", default=[3.0, 6.0, 10.0])
+    parser.add_argument("--walk", type=int, default=2000)
+    parser.add_argument("--cache-mb", type=float, default=64.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'radius':>6} {'degree':>6} {'ball':>8} {'bfs us':>10} {'cached us':>10} "
+          f"{'speedup':>8} {'cache MB':>9} {'evictions':>9}")
+    for radius in args.radii:
+        for degree in args.degrees:
+            fd, path = tempfile.mkstemp(suffix=".json")
+            os.close(fd)
+            try:
+                write_level(generate_level(args.nodes, degree, visibility_radius=radius,
+                                           seed=args.seed), path)
+                plain = GraphColoringGame(path)
+                cached = GraphColoringGame(path, ball_cache_bytes=int(args.cache_mb * 2 ** 20))
+            finally:
+                os.remove(path)
+            walk = random_walk(plain, args.walk, args.seed)
+            bfs_us, ball = measure(plain, walk)
+            measure(cached, walk)
+            cached_us, _ = measure(cached, walk)
+            stats = cached.ball_cache.stats()
+            print(f"{radius:>6} {degree:>6.1f} {ball:>8.1f} {bfs_us:>10.1f} {cached_us:>10.1f} "
+                  f"{bfs_us / cached_us:>7.1f}x {stats['bytes'] / 2 ** 20:>9.2f} "
+                  f"{stats['evictions']:>9}")
@@ -0,0 +1,82 @@
+"""
+Cheap proofs that a game cannot be won.
+
+``check_level`` runs when a level is loaded, cheapest test first:
+
+1. pre-colored nodes with a color the level does not offer, or two adjacent
+   pre-colored nodes with the same color (they can never be re-colored);
+2. a clique larger than the number of colors, found greedily from every node
+   (only on levels of at most ``clique_limit`` nodes);
+3. a complete backtracking search (``planners.exact_coloring``) limited to
+   ``node_budget`` expansions, which settles small and easy levels either way.
+   Each expansion scans the unassigned nodes, so it is off unless asked for.
+
+``steps_needed`` bounds from below the steps a game in progress still needs:
+every step colors one node, so each uncolored node needs a step, each node in
+conflict with a pre-colored neighbor needs one, and the remaining conflict edges
+need at least one recoloring per edge of a matching.
+"""
+
+
+def _greedy_clique(adj, node):
+    clique = [node]
+    candidates = set(adj[node])
+    while candidates:
+        best = max(candidates, key=lambda n: (len(candidates & adj[n]), str(n)))
+        clique.append(best)
+        candidates &= adj[best]
+    return clique
+
+
+def check_level(nodes, adj, colors, pre_colored, node_budget=0, clique_limit=5000):
+    """
+    ``(status, reason)`` with status "feasible", "infeasible" or "unknown" (the
+    search ran out of budget). ``adj`` maps each node to a set of neighbors.
+    """
+    for u, c in pre_colored.items():
+        if c not in colors:
+            return "infeasible", f"pre-colored node '{u}' has color '{c}', not one of the level's colors"
+        for v in adj[u]:
+            if pre_colored.get(v) == c:
+                return "infeasible", f"pre-colored nodes '{u}' and '{v}' are adjacent and both '{c}'"
+
+    k = len(colors)
+    for node in nodes if len(nodes) <= clique_limit else ():
+        if len(adj[node]) < k:
+            continue  # a clique through it has at most deg + 1 <= k nodes
+        clique = _greedy_clique(adj, node)
+        if len(clique) > k:
+            return "infeasible", f"clique of {len(clique)} nodes ({', '.join(map(str, clique[:6]))}" \
+                                 f"{', ...' if len(clique) > 6 else ''}) needs more than {k} colors"
+
+    if not node_budget:
+        return "unknown", "exact check skipped"
+    from planners import exact_coloring  # keeps importing the engine cheap
+    variables = [n for n in nodes if n not in pre_colored]
+    status, _ = exact_coloring(adj, colors, pre_colored, variables, node_budget)
+    if status == "sat":
+        return "feasible", "coloring found"
+    if status == "unsat":
+        return "infeasible", f"no coloring with {k} colors exists (exhaustive search)"
+    return "unknown", f"search gave up after {node_budget} nodes"
+
+
+def steps_needed(edges, node_colors, pre_colored):
+    """Lower bound on the steps left before the coloring can be complete and correct."""
+    forced = {n for n, c in node_colors.items() if c is None}
+    loose = []
+    for u, v in edges:
+        cu = node_colors[u]
+        if cu is None or cu != node_colors[v]:
+            continue
+        if u in pre_colored:
+            forced.add(v)
+        elif v in pre_colored:
+            forced.add(u)
+        else:
+            loose.append((u, v))
+    matched = set()
+    for u, v in loose:  # greedy matching of conflicts no forced recoloring resolves
+        if u not in forced and v not in forced and u not in matched and v not in matched:
+            matched.update((u, v))
+    return len(forced) + len(matched) // 2
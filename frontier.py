@@ -0,0 +1,105 @@
+"""
+Frontier index for information-gain exploration.
+
+The frontier is the set of known nodes whose neighborhoods have not been fully
+observed. A node is fully observed once it lies strictly inside the visible ball
+around the agent: the engine reveals every edge of such a node. The visibility
+radius is not part of the observation, so it is bounded from below by the depth
+of the visible ball (distances inside the ball are true distances).
+
+A frontier node's information gain is estimated as the number of neighbors it
+is still missing compared with the average degree of explored nodes. The agent
+heads for the frontier node with the best gain per move, deterministically,
+instead of taking a random step.
+"""
+from collections import deque
+
+
+class FrontierIndex:
+    """Known-but-unexplored nodes of ``adjacency`` (held by reference) and their gains."""
+    def __init__(self, adjacency, min_gain=0.25):
+        self.adjacency = adjacency
+        self.min_gain = min_gain
+        self.frontier = set()
+        self.explored = set()
+        self.depth = 0  # deepest visible ball seen so far (the radius, on large enough graphs)
+        self._explored_degree = 0
+
+    def observe(self, visible_state):
+        """Update after the observation has been merged into the adjacency."""
+        visible = set(visible_state['visible_graph']['nodes'])
+        current = visible_state['current_node']
+        for node in visible:
+            if node not in self.explored:
+                self.frontier.add(node)
+
+        # Depths inside the visible ball; nodes shallower than its depth are explored
+        depth = {current: 0}
+        queue = deque([current])
+        while queue:
+            node = queue.popleft()
+            for neighbor in self.adjacency[node]:
+                if neighbor in visible and neighbor not in depth:
+                    depth[neighbor] = depth[node] + 1
+                    queue.append(neighbor)
+        ball_depth = max(depth.values())
+        self.depth = max(self.depth, ball_depth)
+        for node, d in depth.items():
+            if d < ball_depth or node == current:
+                self.mark_explored(node)
+
+    def explored_from(self, node):
+        """Frontier nodes an observation at ``node`` would fully observe (known graph only)."""
+        reach = {node}
+        level = [node]
+        for _ in range(self.depth - 1):
+            level = [nb for n in level for nb in self.adjacency[n] if nb not in reach]
+            reach.update(level)
+        return reach & self.frontier
+
+    def mark_explored(self, node):
+        if node not in self.explored:
+            self.explored.add(node)
+            self.frontier.discard(node)
+            self._explored_degree += len(self.adjacency[node])
+
+    def expected_degree(self):
+        if not self.explored:
+            return 0.0
+        return self._explored_degree / len(self.explored)
+
+    def gain(self, node):
+        """Estimated number of neighbors of ``node`` not seen yet."""
+        return max(self.expected_degree() - len(self.adjacency[node]), self.min_gain)
+
+    def best_target(self, start):
+        """
+        Frontier node with the highest gain / (1 + distance) from ``start`` and the first
+        hop toward it, as (target, next_hop); ties go to the closer, then smaller name.
+        The BFS stops once no farther node could beat the best score. (None, None) if
+        the frontier is unreachable.
+        """
+        if not self.frontier:
+            return None, None
+        bound = max(self.expected_degree(), self.min_gain)
+        best_key, best = None, (None, None)
+        first_hop = {start: start}
+        level = [start]
+        d = 0
+        while level:
+            if best_key is not None and bound / (1 + d) < -best_key[0]:
+                break
+            for node in level:
+                if node in self.frontier:
+                    key = (-self.gain(node) / (1 + d), d, node)
+                    if best_key is None or key < best_key:
+                        best_key, best = key, (node, first_hop[node])
+            following = []
+            for node in level:
+                for neighbor in self.adjacency[node]:
+                    if neighbor not in first_hop:
+                        first_hop[neighbor] = neighbor if node == start else first_hop[node]
+                        following.append(neighbor)
+            level = sorted(following)
+            d += 1
+        return best
@@ -0,0 +1,356 @@
+"""
+Differential fuzzing of the engine's optimized paths and of the planners.
+
+For every seed a random level is generated (size, degree, colors, radius and
+pre-colored nodes all drawn from the seed) and checked two ways:
+
+- Engine: an agent plays the level on the reference engine (default options)
+  while its actions, every observation and every validation decision are
+  traced. The same actions are then replayed through ``GameRunner`` on each
+  optimized engine configuration (ball cache, view observations, integer-ID
+  observations, tiny caches that evict constantly). Observations (decoded to
+  names in "ids" mode) are compared as sets, so a backend may
+  reorder nodes and edges but not change them; validation decisions and the
+  final ``get_final_summary`` must match exactly.
+- Planners: ``exact_coloring`` must agree with brute force on small levels
+  and return valid colorings; ``LocalSearchPlanner.last_conflicts`` must equal
+  the conflicts actually left in its plan; ``NavigationIndex`` distances must
+  match a plain BFS.
+
+Seeds run in parallel processes. A failing level is shrunk by delta debugging
+(dropping nodes, then edges and pre-colors, while the same check still fails)
+and written to ``--out`` as a reproducer.
+
+    python fuzz.py --seeds 0-999 --jobs 8
+    python fuzz.py --replay fuzz_failures/seed_17.json
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import random
+import tempfile
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from agent_registry import default_registry
+from game_runner import GameRunner
+from level_generator import generate_level, write_level
+from navigation import NavigationIndex
+from observation import decode_observation
+from planners import LocalSearchPlanner, exact_coloring
+
+ENGINE_VARIANTS = {
+    "ball_cache": {"ball_cache_bytes": 1 << 20},
+    "ball_cache_tiny": {"ball_cache_bytes": 2048},
+    "precomputed": {"ball_cache_bytes": 1 << 20, "precompute_balls": True},
+    "view": {"observation_mode": "view"},
+    "view_tiny": {"observation_mode": "view", "view_cache_size": 2, "ball_cache_bytes": 2048},
+    "ids": {"observation_mode": "ids"},
+    "ids_tiny": {"observation_mode": "ids", "view_cache_size": 2, "ball_cache_bytes": 2048},
+}
+
+
+def random_level(seed):
+    rng = random.Random(seed)
+    return generate_level(rng.randint(2, 40), rng.uniform(1.0, 5.0), rng.randint(2, 4),
+                          rng.randint(1, 3), rng.randint(0, 4), seed)
+
+
+def _normalize(state):
+    if "ids" in state:
+        state = decode_observation(state)
+    graph = state["visible_graph"]
+    return (state["current_node"], tuple(state["available_colors"]), sorted(graph["nodes"]),
+            sorted(tuple(sorted(e)) for e in graph["edges"]),
+            sorted(state["node_colors"].items(), key=lambda kv: kv[0]))
+
+
+class _TracingRunner(GameRunner):
+    """GameRunner that records observations, actions and validation decisions."""
+    def __init__(self, level_file, agent_class, engine_options=None):
+        # Per-step protocol only, so the replay sees the same sequence of observations
+        super().__init__(level_file, agent_class, engine_options, action_plans=False)
+        self.trace = [("initial", _normalize(self.game.get_visible_state()))]
+        observe = self.game.get_visible_state
+
+        def traced():
+            state = observe()
+            self.trace.append(("observe", _normalize(state)))
+            return state
+        self.game.get_visible_state = traced
+
+    def _validate_move(self, action, state):
+        result = super()._validate_move(action, state)
+        self.trace.append(("move", self._named(action), result))
+        return result
+
+    def _validate_color(self, action, state):
+        result = super()._validate_color(action, state)
+        self.trace.append(("color", self._named(action), result))
+        return result
+
+    def _named(self, action):
+        """``action`` with names in place of IDs, as the reference run traced it."""
+        if self.game.id_table is None or not isinstance(action, dict):
+            return action
+        action = dict(action)
+        if 'node' in action:
+            action['node'] = self._node_name(action['node'])
+        if 'color' in action:
+            action['color'] = self._color_name(action['color'])
+        return action
+
+
+class _ReplayAgent:
+    """Plays back the actions an agent took in the reference run (as IDs in "ids" mode)."""
+    actions = []
+
+    def __init__(self, initial_state):
+        self._actions = iter(self.actions)
+        self._ids = initial_state.get("ids")
+
+    def _next(self):
+        action = next(self._actions)
+        table = self._ids
+        if table is None or not isinstance(action, dict):
+            return action
+        action = dict(action)
+        node_id = table.node_id(action.get("node"))
+        if node_id is not None:
+            action["node"] = node_id
+        color_id = table.color_id(action.get("color"))
+        if color_id is not None:
+            action["color"] = color_id
+        return action
+
+    def get_next_move(self, visible_state):
+        return self._next()
+
+    def get_color_for_node(self, node, visible_state):
+        return self._next()
+
+
+def _play(level_file, agent_class, engine_options=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner = _TracingRunner(level_file, agent_class, engine_options)
+        summary = runner.run_game()
+    return runner.trace, summary
+
+
+def check_engine(level_file, agent_name="B22CH032", variants=ENGINE_VARIANTS):
+    """Divergence messages between the reference engine and each variant."""
+    agent_class = default_registry.get(agent_name)
+    random.seed(0)
+    trace, summary = _play(level_file, agent_class)
+    replay = type("Replay", (_ReplayAgent,), {
+        "actions": [entry[1] for entry in trace if entry[0] in ("move", "color")]})
+    problems = []
+    for name, options in variants.items():
+        try:
+            other, other_summary = _play(level_file, replay, options)
+        except Exception as e:  # an engine crash is a divergence too
+            problems.append(f"{name}: crashed with {type(e).__name__}: {e}")
+            continue
+        for i, (a, b) in enumerate(itertools.zip_longest(trace, other)):
+            if a != b:
+                problems.append(f"{name}: trace differs at event {i}: {a!r} != {b!r}")
+                break
+        if other_summary != summary:
+            problems.append(f"{name}: summary {other_summary!r} != {summary!r}")
+    return problems
+
+
+def _brute_force_colorable(adjacency, colors, fixed, variables):
+    for combo in itertools.product(colors, repeat=len(variables)):
+        coloring = dict(fixed, **dict(zip(variables, combo)))
+        if all(coloring[u] != coloring[v] for u in variables for v in adjacency[u]):
+            return True
+    return False
+
+
+def check_planners(level, brute_force_limit=8):
+    """Disagreements between the planners and straightforward reference computations."""
+    adjacency = defaultdict(set)
+    for n in level["graph"]["nodes"]:
+        adjacency[n]
+    for u, v in level["graph"]["edges"]:
+        adjacency[u].add(v)
+        adjacency[v].add(u)
+    colors, fixed = level["colors"], level["pre_colored"]
+    variables = sorted(n for n in adjacency if n not in fixed)
+    fixed_ok = all(fixed[u] != fixed.get(v) for u in fixed for v in adjacency[u])
+    problems = []
+
+    status, assignment = exact_coloring(adjacency, colors, fixed, variables)
+    if status == "sat":
+        full = dict(fixed, **assignment)
+        bad = [(u, v) for u in variables for v in adjacency[u] if full[u] == full[v]]
+        if bad or set(assignment) != set(variables):
+            problems.append(f"exact_coloring: invalid 'sat' assignment, conflicts {bad[:3]}")
+    if len(variables) <= brute_force_limit:
+        expected = fixed_ok and _brute_force_colorable(adjacency, colors, fixed, variables)
+        if fixed_ok and (status == "sat") != expected:
+            problems.append(f"exact_coloring: says {status}, brute force says "
+                            f"{'sat' if expected else 'unsat'}")
+
+    for method in ("min_conflicts", "tabu"):
+        planner = LocalSearchPlanner(method=method, max_steps=200)
+        plan = planner.plan(adjacency, colors, fixed, variables)
+        full = dict(fixed, **plan)
+        actual = sum(1 for u in variables for v in adjacency[u]
+                     if full.get(v) == full[u] and (v in fixed or u < v))
+        if actual != planner.last_conflicts:
+            problems.append(f"{method}: last_conflicts={planner.last_conflicts}, "
+                            f"plan has {actual}")
+        if fixed_ok and status == "unsat" and actual == 0:
+            problems.append(f"{method}: found a valid coloring of an 'unsat' level")
+
+    # Trees are built halfway through, so the rest of the edges are relaxed incrementally
+    navigation = NavigationIndex(defaultdict(set))
+    edges = level["graph"]["edges"]
+    for i, (u, v) in enumerate(edges):
+        if i == len(edges) // 2:
+            for source in list(adjacency)[:5]:
+                navigation.tree(source)
+        navigation.adjacency[u].add(v)
+        navigation.adjacency[v].add(u)
+        navigation.add_edge(u, v)
+    for source in list(adjacency)[:5]:
+        dist, queue = {source: 0}, deque([source])
+        while queue:
+            node = queue.popleft()
+            for nb in adjacency[node]:
+                if nb not in dist:
+                    dist[nb] = dist[node] + 1
+                    queue.append(nb)
+        if dict(navigation.tree(source).dist) != dist:
+            problems.append(f"NavigationIndex: distances from {source} differ from BFS")
+    return problems
+
+
+def check_level(level, agent_name="B22CH032"):
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        write_level(level, path)
+        return check_engine(path, agent_name) + check_planners(level)
+    except Exception as e:
+        return [f"harness: {type(e).__name__}: {e}"]
+    finally:
+        os.remove(path)
+
+
+def _without(level, nodes=(), edges=(), pre=()):
+    nodes, edges, pre = set(nodes), set(map(tuple, edges)), set(pre)
+    return dict(level, graph={
+        "nodes": [n for n in level["graph"]["nodes"] if n not in nodes],
+        "edges": [e for e in level["graph"]["edges"]
+                  if tuple(e) not in edges and e[0] not in nodes and e[1] not in nodes],
+    }, pre_colored={n: c for n, c in level["pre_colored"].items()
+                    if n not in nodes and n not in pre})
+
+
+def _ddmin(items, fails):
+    """1-minimal sublist of ``items`` for which ``fails`` still holds (ddmin)."""
+    keep = list(items)
+    chunks = 2
+    while len(keep) >= 2:
+        size = -(-len(keep) // chunks)
+        reduced = False
+        for i in range(0, len(keep), size):
+            candidate = keep[:i] + keep[i + size:]
+            if fails(candidate):
+                keep, chunks, reduced = candidate, max(chunks - 1, 2), True
+                break
+        if not reduced:
+            if chunks >= len(keep):
+                break
+            chunks = min(chunks * 2, len(keep))
+    if len(keep) == 1 and fails([]):
+        keep = []
+    return keep
+
+
+def _kind(problem):
+    """Which check a problem came from, e.g. ``"B22CH032: trace"``, ignoring its details."""
+    check, _, detail = problem.partition(": ")
+    return f"{check}: {detail.split()[0].split('=')[0].rstrip(':')}" if detail else check
+
+
+def shrink(level, agent_name="B22CH032"):
+    """Delta-debug ``level`` down to a small level on which the original failure persists.
+
+    A reduction only counts if one of the checks that failed on ``level`` still
+    fails, so shrinking cannot drift into an unrelated bug (or a harness error
+    on a degenerate level).
+    """
+    kinds = {_kind(p) for p in check_level(level, agent_name)}
+
+    def fails(lv):
+        return any(_kind(p) in kinds for p in check_level(lv, agent_name))
+
+    start = level["start_node"]
+    others = [n for n in level["graph"]["nodes"] if n != start]
+    kept = _ddmin(others, lambda keep: fails(_without(level, set(others) - set(keep))))
+    level = _without(level, set(others) - set(kept))
+    edges = [tuple(e) for e in level["graph"]["edges"]]
+    kept = _ddmin(edges, lambda keep: fails(_without(level, edges=set(edges) - set(keep))))
+    level = _without(level, edges=set(edges) - set(kept))
+    pre = list(level["pre_colored"])
+    kept = _ddmin(pre, lambda keep: fails(_without(level, pre=set(pre) - set(keep))))
+    return _without(level, pre=set(pre) - set(kept))
+
+
+def run_seed(seed, agent_name="B22CH032"):
+    level = random_level(seed)
+    problems = check_level(level, agent_name)
+    return seed, level, problems
+
+
+def _parse_seeds(text):
+    seeds = []
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        seeds.extend(range(int(lo), int(hi or lo) + 1))
+    return seeds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Differential fuzzing of engine and planners.")
+    parser.add_argument("--seeds", default="0-199", help="e.g. 0-999 or 3,7,10-20")
+    parser.add_argument("--agent", default="B22CH032")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="fuzz_failures")
+    parser.add_argument("--no-shrink", action="store_true")
+    parser.add_argument("--replay", help="re-check a saved reproducer")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay) as f:
+            saved = json.load(f)
+        problems = check_level(saved["level"], saved.get("agent", args.agent))
+        print("\n".join(problems) or "No divergence.")
+        raise SystemExit(1 if problems else 0)
+
+    seeds = _parse_seeds(args.seeds)
+    failures = 0
+    with ProcessPoolExecutor(args.jobs) as pool:
+        for seed, level, problems in pool.map(run_seed, seeds, [args.agent] * len(seeds),
+                                              chunksize=4):
+            if not problems:
+                continue
+            failures += 1
+            print(f"seed {seed}: {problems[0]}" + (f" (+{len(problems) - 1} more)"
+                                                    if len(problems) > 1 else ""))
+            small = level if args.no_shrink else shrink(level, args.agent)
+            os.makedirs(args.out, exist_ok=True)
+            path = os.path.join(args.out, f"seed_{seed}.json")
+            with open(path, "w") as f:
+                json.dump({"seed": seed, "agent": args.agent, "level": small,
+                           "problems": check_level(small, args.agent)}, f, indent=2)
+            print(f"  reproducer with {len(small['graph']['nodes'])} nodes: {path}")
+    print(f"{len(seeds)} levels, {failures} with divergences")
+    raise SystemExit(1 if failures else 0)
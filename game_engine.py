@@ -1,10 +1,33 @@
 
 import json
-from collections import deque, defaultdict
+from collections import OrderedDict, defaultdict
 import math
 
+from ball_cache import BallCache, compute_ball
+from feasibility import check_level, steps_needed
+from observation import IdTable, IdTableView, build_view
+
 class GraphColoringGame:
-    def __init__(self, level_file):
+    """
+    Holds the level and the true coloring, and answers the agent's observations.
+
+    ``ball_cache_bytes`` memoizes each node's visible ball (see ``ball_cache``) up
+    to that many bytes, evicting least recently used balls; ``precompute_balls``
+    fills the cache for every node up front. Observations are identical either way.
+
+    ``observation_mode="view"`` returns read-only views (see ``observation``) that
+    are built once per node and reused, at most ``view_cache_size`` of them, instead
+    of fresh lists and dicts on every call. ``observation_mode="ids"`` encodes
+    node and color names as integers (see ``observation``); each node's encoded
+    ball is kept the same way, and ``self.id_table`` translates back.
+
+    On load the level is checked for feasibility (see ``feasibility``); the result
+    is ``self.feasibility = (status, reason)``. ``feasibility_budget`` bounds the
+    exact search part of the check; it is 0 (skipped) by default, since its cost
+    grows quadratically with the level.
+    """
+    def __init__(self, level_file, ball_cache_bytes=None, precompute_balls=False,
+                 observation_mode="copy", view_cache_size=4096, feasibility_budget=0):
         with open(level_file) as f:
             data = json.load(f)
         
@@ -25,37 +48,101 @@ class GraphColoringGame:
         self.moves = 0
         self.current_node = self.start_node
 
+        self.ball_cache = None
+        if ball_cache_bytes is not None:
+            self.ball_cache = BallCache(self.adj, self.visibility_radius, ball_cache_bytes)
+            if precompute_balls:
+                self.ball_cache.precompute(self.nodes)
+
+        if observation_mode not in ("copy", "view", "ids"):
+            raise ValueError(f"Unknown observation_mode '{observation_mode}'.")
+        self.observation_mode = observation_mode
+        self.view_cache_size = view_cache_size
+        self._views = OrderedDict()  # node -> read-only observation (or encoded ball), LRU order
+        self._color_tuple = tuple(self.colors)
+        self.id_table = None
+        if observation_mode == "ids":
+            extra = {c for c in self.pre_colored.values() if c not in self.colors}
+            self.id_table = IdTable(self.colors + sorted(extra, key=str))
+            self._id_view = IdTableView(self.id_table)  # what agents see; the referee keeps the table
+            self._color_codes = {None: None, **self.id_table.color_ids}
+            self._color_id_tuple = tuple(range(len(self.colors)))
+
+        adjacency = {n: set(self.adj[n]) for n in self.nodes}
+        self.feasibility = check_level(self.nodes, adjacency, self.colors, self.pre_colored,
+                                       feasibility_budget)
+
     def get_visible_state(self):
         """
         Returns the limited, partially observable state for the agent.
         """
-        queue = deque([(self.current_node, 0)])
-        visited_bfs = {self.current_node}
-        visible_nodes = {self.current_node}
-        visible_edges = set()
-
-        while queue:
-            node, distance = queue.popleft()
-            if distance >= self.visibility_radius:
-                continue
-            
-            for neighbor in self.adj[node]:
-                visible_edges.add(tuple(sorted((node, neighbor))))
-                if neighbor not in visited_bfs:
-                    visited_bfs.add(neighbor)
-                    visible_nodes.add(neighbor)
-                    queue.append((neighbor, distance + 1))
+        if self.observation_mode == "view":
+            return self._get_view(self.current_node)
+        if self.observation_mode == "ids":
+            return self._get_encoded(self.current_node)
+        if self.ball_cache is not None:
+            nodes, flat = self.ball_cache.get(self.current_node)
+            visible_nodes = list(nodes)
+            visible_edges = [[flat[i], flat[i + 1]] for i in range(0, len(flat), 2)]
+        else:
+            visible_nodes, edges = compute_ball(self.adj, self.current_node, self.visibility_radius)
+            visible_edges = [list(e) for e in edges]
         
         return {
             "current_node": self.current_node,
             "available_colors": self.colors,
             "visible_graph": {
-                "nodes": list(visible_nodes),
-                "edges": [list(e) for e in visible_edges if e[0] in visible_nodes and e[1] in visible_nodes],
+                "nodes": visible_nodes,
+                "edges": visible_edges,
             },
             "node_colors": {n: self.node_colors[n] for n in visible_nodes}
         }
 
+    def _get_view(self, center):
+        view = self._views.get(center)
+        if view is not None:
+            self._views.move_to_end(center)
+            return view
+        if self.ball_cache is not None:
+            nodes, flat = self.ball_cache.get(center)
+            edges = tuple(zip(flat[0::2], flat[1::2]))
+        else:
+            nodes, edges = compute_ball(self.adj, center, self.visibility_radius)
+            nodes, edges = tuple(nodes), tuple(edges)
+        view = build_view(center, nodes, edges, self._color_tuple, self.node_colors)
+        self._views[center] = view
+        if len(self._views) > self.view_cache_size:
+            self._views.popitem(last=False)
+        return view
+
+    def _get_encoded(self, center):
+        ball = self._views.get(center)
+        if ball is not None:
+            self._views.move_to_end(center)
+        else:
+            if self.ball_cache is not None:
+                nodes, flat = self.ball_cache.get(center)
+                edges = zip(flat[0::2], flat[1::2])
+            else:
+                nodes, edges = compute_ball(self.adj, center, self.visibility_radius)
+            node_ids, flat = self.id_table.encode(nodes, edges)
+            ball = (tuple(nodes), tuple(node_ids), node_ids, flat)
+            self._views[center] = ball
+            if len(self._views) > self.view_cache_size:
+                self._views.popitem(last=False)
+        names, id_tuple, node_ids, flat = ball
+        colors, codes = self.node_colors, self._color_codes
+        return {
+            "current_node": self.id_table.node_id(center),
+            "available_colors": self._color_id_tuple,
+            "visible_graph": {
+                "nodes": node_ids[:],  # copies, so agents can keep or modify them
+                "edges": flat[:],
+            },
+            "node_colors": {i: codes[colors[n]] for i, n in zip(id_tuple, names)},
+            "ids": self._id_view,
+        }
+
     def move_to(self, node):
         """Updates the agent's current position and tracks move counts."""
         if node != self.current_node:
@@ -74,6 +161,10 @@ class GraphColoringGame:
         self.node_colors[node] = color
         return f"Colored {node} with {color}."
 
+    def steps_needed(self):
+        """Lower bound on the steps still needed to finish correctly (see ``feasibility``)."""
+        return steps_needed(self.edges, self.node_colors, self.pre_colored)
+
     def is_fully_and_correctly_colored(self):
         """Checks if the entire graph is solved."""
         if not all(self.node_colors.get(n) is not None for n in self.nodes):
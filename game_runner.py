@@ -1,67 +1,325 @@
+import contextlib
+import glob
 import json
+import os
+import random
+import sys
+import time
+
+from agent_registry import default_registry
 from game_engine import GraphColoringGame
-from student_template import CSP_AGENT 
-from B22CH032 import B22CH032
-from B22EE088 import B22EE088
+from observation import edge_pairs
+
+EARLY_TERMINATION_BUDGET = 20000  # exact feasibility search expansions at load
 
 class GameRunner:
     """
     The trusted "Referee" for the new assignment rules. It enforces the
     "Move-Then-Color" two-phase turn cycle.
+
+    Agents may optionally implement the multi-step protocol, which the referee uses
+    unless ``action_plans=False``. It cuts agent calls and wall time on levels with
+    long walks over colored nodes (see ``bench_action_plans``).
+
+    - ``get_action_plan(visible_state)`` is called instead of ``get_next_move``
+      and returns either a move action as usual, or a plan
+      ``{"steps": [(move_action, color_action), ...], "interrupt_on": ["new_nodes",
+      "new_edges"], "watch": [nodes]}``. The referee executes the steps one per
+      turn with the same validation and scoring, and hands control back early
+      when an observation shows a node or edge the agent has not been shown
+      before (as requested in ``interrupt_on``) or any ``watch`` node.
+    - ``plan_finished(observations, reason)``, if defined, then receives the
+      observations made while the plan ran (one per step, after its move).
+
+    ``memory="tracemalloc"|"rss"`` measures the agent's memory (see
+    ``memory_monitor``) and adds it to the summary as ``memory``;
+    ``memory_limit`` (bytes, tracemalloc unless ``memory`` says otherwise)
+    disqualifies an agent that goes over it.
+
+    ``metrics`` (a ``metrics.TournamentMetrics``) records agent-call latencies
+    and, when the game ends, its steps, duration and outcome under ``agent_name``.
+
+    With ``early_termination`` a game ends as soon as failure is certain: the
+    level failed the engine's feasibility check, or the steps left are fewer than
+    the uncolored and conflicting nodes need. The summary (score -inf, as the full
+    game would have scored) then has a ``terminated_early`` reason. Only then does
+    the engine run the exact part of its check (``EARLY_TERMINATION_BUDGET``
+    expansions, unless ``engine_options`` sets ``feasibility_budget``).
+
+    With ``engine_options={"observation_mode": "ids"}`` the agent sees and answers
+    in integer IDs (see ``observation``); actions are validated against the encoded
+    observation and translated back to names for the engine, the transcript,
+    error messages and the summary.
     """
-    def __init__(self, level_file, agent_class):
-        self.game = GraphColoringGame(level_file)
-        self.agent = agent_class(self.game.get_visible_state())
+    def __init__(self, level_file, agent_class, engine_options=None, action_plans=True,
+                 memory=None, memory_limit=None, metrics=None, agent_name=None,
+                 early_termination=False):
+        # engine_options: extra GraphColoringGame keyword arguments (e.g. ball_cache_bytes)
+        engine_options = dict(engine_options or {})
+        if early_termination:
+            engine_options.setdefault("feasibility_budget", EARLY_TERMINATION_BUDGET)
+        self.game = GraphColoringGame(level_file, **engine_options)
+        initial_state = self.game.get_visible_state()
+        self.memory = None
+        if memory or memory_limit is not None:
+            from memory_monitor import MemoryMonitor
+            self.memory = MemoryMonitor(memory or "tracemalloc", memory_limit)
+            self.memory.start()  # the agent's own state counts from its construction
+        self._failure = None
+        try:
+            self.agent = agent_class(initial_state)
+        except MemoryError:
+            if self.memory is None:
+                raise
+            self.agent = None
+            self._failure = self.memory.exceeded("__init__")
+        except BaseException:
+            if self.memory is not None:
+                self.memory.stop()  # never leave the rss cap on a reused process
+            raise
+        if self.memory is not None:
+            self.memory.suspend()  # capped again only while the game runs
+        if self._failure is None:
+            self._failure = self._check_memory()
         self.max_steps = len(self.game.nodes) * 10 # Arbitrary large limit to prevent infinite loops.  
+        self.early_termination = early_termination
+        self.metrics = metrics
+        self.agent_name = agent_name or getattr(agent_class, "__name__", repr(agent_class))
+        self.steps_played = 0
+        self._call_seconds = None  # call -> latency histogram, bound once per game
+        if metrics is not None:
+            self._call_seconds = {call: metrics.call_seconds.labels(call)
+                                  for call in ("move", "color", "plan_finished")}
+        self.action_plans = action_plans and hasattr(self.agent, "get_action_plan")
+        # What the agent has been shown, for plan interrupts
+        self._seen_nodes = set()
+        self._seen_edges = set()
+        if self.action_plans:
+            self._show(initial_state)
+
+    def _show(self, state):
+        """Record an observation as seen; True if it had a node or edge not seen before."""
+        graph = state['visible_graph']
+        nodes, edges = self._seen_nodes, self._seen_edges
+        new_nodes = new_edges = False
+        for n in graph['nodes']:
+            if n not in nodes:
+                nodes.add(n)
+                new_nodes = True
+        for e in edge_pairs(graph['edges']):
+            e = tuple(e)
+            if e not in edges:
+                edges.add(e)
+                new_edges = True
+        return new_nodes, new_edges
 
     def run_game(self):
         """
         Runs the new two-phase game loop.
         """
+        started = time.perf_counter()
+        if self.memory is None:
+            summary = self._play()
+        else:
+            try:
+                self.memory.resume()
+                summary = self._play()
+            finally:
+                self.memory.stop()
+            summary['memory'] = self.memory.report()
+        if self.metrics is not None:
+            self.metrics.game_finished(self.agent_name, summary,
+                                       time.perf_counter() - started, self.steps_played)
+        return summary
+
+    def _check_memory(self):
+        """Disqualification message if the agent is over its memory limit, else None."""
+        return self.memory.sample() if self.memory is not None else None
+
+    def _crashed(self, where, error):
+        if isinstance(error, MemoryError) and self.memory is not None:
+            return self.memory.exceeded(where)
+        return f"Agent crashed in {where}: {error}"
+
+    def _certain_failure(self, step):
+        """Why the game can no longer be won before ``step``, or None."""
+        status, reason = self.game.feasibility
+        if status == "infeasible":
+            return f"Level is not colorable: {reason}."
+        left = self.max_steps - step
+        if left < len(self.game.nodes):  # the bound never exceeds the node count
+            needed = self.game.steps_needed()
+            if needed > left:
+                return f"At least {needed} more steps are needed with {left} left."
+        return None
+
+    def _end_early(self, reason):
+        print("\n--- Failure is certain. Game Over. ---")
+        print(reason)
+        summary = self.game.get_final_summary()
+        summary['terminated_early'] = reason
+        return summary
+
+    def _play(self):
+        if self._failure:
+            return self._fail_game(self._failure)
         print(f"Starting level. Agent at: {self.game.current_node}")
+        status, reason = self.game.feasibility
+        if status == "infeasible":
+            print(f"Warning: level is not colorable: {reason}.")
 
+        plan = None
         for step in range(self.max_steps):
+            if self.early_termination:
+                reason = self._certain_failure(step)
+                if reason:
+                    return self._end_early(reason)
             print(f"\n--- Step {step + 1} ---")
-            
-            # --- PHASE 1: GET MOVE DECISION ---
-            print(f"Agent is at '{self.game.current_node}'. Requesting next move...")
-            visible_state = self.game.get_visible_state()
-            try:
-                move_action = self.agent.get_next_move(visible_state)
-            except Exception as e:
-                return self._fail_game(f"Agent crashed in get_next_move: {e}")
-            
-            is_valid, message = self._validate_move(move_action, visible_state)
-            if not is_valid:
-                return self._fail_game(f"Invalid move action: {message}")
-
-            self.game.move_to(move_action['node'])
-            print(f"Referee: Moved agent to '{self.game.current_node}'.")
-
-            # --- PHASE 2: FORCE COLOR DECISION ---
-            print(f"Agent is now at '{self.game.current_node}'. Requesting color...")
-            visible_state_after_move = self.game.get_visible_state()
-            try:
-                color_action = self.agent.get_color_for_node(self.game.current_node, visible_state_after_move)
-            except Exception as e:
-                return self._fail_game(f"Agent crashed in get_color_for_node: {e}")
+            self.steps_played = step + 1
+
+            if plan is None:
+                # --- PHASE 1: GET MOVE DECISION ---
+                print(f"Agent is at '{self.game.current_node}'. Requesting next move...")
+                visible_state = self.game.get_visible_state()
+                started = time.perf_counter()
+                try:
+                    if self.action_plans:
+                        self._show(visible_state)
+                        move_action = self.agent.get_action_plan(visible_state)
+                    else:
+                        move_action = self.agent.get_next_move(visible_state)
+                except Exception as e:
+                    where = "get_action_plan" if self.action_plans else "get_next_move"
+                    return self._fail_game(self._crashed(where, e))
+                if self._call_seconds is not None:
+                    self._call_seconds['move'].observe(time.perf_counter() - started)
+                failure = self._check_memory()
+                if failure:
+                    return self._fail_game(failure)
 
-            is_valid, message = self._validate_color(color_action, visible_state_after_move)
-            if not is_valid:
-                return self._fail_game(f"Invalid color action: {message}")
+                if isinstance(move_action, dict) and 'steps' in move_action:
+                    plan, message = self._start_plan(move_action, visible_state)
+                    if plan is None:
+                        return self._fail_game(f"Invalid action plan: {message}")
+                else:
+                    is_valid, message = self._validate_move(move_action, visible_state)
+                    if not is_valid:
+                        return self._fail_game(f"Invalid move action: {message}")
 
-            self.game.assign_color(color_action['node'], color_action['color'])
-            print(f"Referee: Assigned color '{color_action['color']}' to node '{color_action['node']}'.")
+                    self.game.move_to(self._node_name(move_action['node']))
+                    print(f"Referee: Moved agent to '{self.game.current_node}'.")
 
+                    # --- PHASE 2: FORCE COLOR DECISION ---
+                    print(f"Agent is now at '{self.game.current_node}'. Requesting color...")
+                    visible_state_after_move = self.game.get_visible_state()
+                    if self.action_plans:
+                        self._show(visible_state_after_move)
+                    started = time.perf_counter()
+                    try:
+                        color_action = self.agent.get_color_for_node(
+                            visible_state_after_move['current_node'], visible_state_after_move)
+                    except Exception as e:
+                        return self._fail_game(self._crashed("get_color_for_node", e))
+                    if self._call_seconds is not None:
+                        self._call_seconds['color'].observe(time.perf_counter() - started)
+                    failure = self._check_memory()
+                    if failure:
+                        return self._fail_game(failure)
+
+                    is_valid, message = self._validate_color(color_action, visible_state_after_move)
+                    if not is_valid:
+                        return self._fail_game(f"Invalid color action: {message}")
+
+                    node, color = self._decoded(color_action)
+                    self.game.assign_color(node, color)
+                    print(f"Referee: Assigned color '{color}' to node '{node}'.")
+
+                    if self.game.is_fully_and_correctly_colored():
+                        print("\n--- Puzzle Solved! ---")
+                        break
+                    continue
+
+            # --- PLANNED STEP: move and color from the agent's submitted plan ---
+            failure = self._run_plan_step(plan)
+            if failure:
+                return self._fail_game(failure)
             if self.game.is_fully_and_correctly_colored():
                 print("\n--- Puzzle Solved! ---")
                 break
+            if plan['done']:
+                failure = self._finish_plan(plan)
+                if failure:
+                    return self._fail_game(failure)
+                plan = None
         
         if not self.game.is_fully_and_correctly_colored():
             print("\n--- Max steps reached or puzzle incorrect. Game Over. ---")
 
         return self.game.get_final_summary()
 
+    # --- MULTI-STEP PLANS ---
+
+    def _start_plan(self, action, visible_state):
+        steps = action.get('steps')
+        if not isinstance(steps, (list, tuple)) or not steps:
+            return None, "'steps' must be a non-empty list of (move_action, color_action) pairs."
+        if any(not isinstance(s, (list, tuple)) or len(s) != 2 for s in steps):
+            return None, "Each step must be a (move_action, color_action) pair."
+        interrupt_on = set(action.get('interrupt_on', ()))
+        if not interrupt_on <= {'new_nodes', 'new_edges'}:
+            return None, f"Unknown interrupt conditions {sorted(interrupt_on - {'new_nodes', 'new_edges'})}."
+        print(f"Agent submitted a plan of {len(steps)} steps.")
+        return {'steps': steps, 'next': 0, 'interrupt_on': interrupt_on,
+                'watch': set(action.get('watch', ())), 'state': visible_state,
+                'observations': [], 'done': False, 'reason': None}, None
+
+    def _run_plan_step(self, plan):
+        """Execute the plan's next (move, color) step; returns an error message on failure."""
+        move_action, color_action = plan['steps'][plan['next']]
+        plan['next'] += 1
+
+        # The node set seen before the move is the one after the previous step's move
+        is_valid, message = self._validate_move(move_action, plan['state'])
+        if not is_valid:
+            return f"Invalid move action: {message}"
+        self.game.move_to(self._node_name(move_action['node']))
+        visible_state = self.game.get_visible_state()
+        plan['state'] = visible_state
+        plan['observations'].append(visible_state)
+
+        is_valid, message = self._validate_color(color_action, visible_state)
+        if not is_valid:
+            return f"Invalid color action: {message}"
+        node, color = self._decoded(color_action)
+        self.game.assign_color(node, color)
+        print(f"Referee: Planned step to '{node}', colored '{color}'.")
+
+        new_nodes, new_edges = self._show(visible_state)
+        if new_nodes and 'new_nodes' in plan['interrupt_on']:
+            plan['reason'] = 'new_nodes'
+        elif new_edges and 'new_edges' in plan['interrupt_on']:
+            plan['reason'] = 'new_edges'
+        elif plan['watch'] and any(n in plan['watch'] for n in visible_state['visible_graph']['nodes']):
+            plan['reason'] = 'watch'
+        elif plan['next'] == len(plan['steps']):
+            plan['reason'] = 'completed'
+        plan['done'] = plan['reason'] is not None
+        return None
+
+    def _finish_plan(self, plan):
+        print(f"Plan ended after {plan['next']}/{len(plan['steps'])} steps ({plan['reason']}).")
+        finished = getattr(self.agent, "plan_finished", None)
+        if finished is None:
+            return None
+        started = time.perf_counter()
+        try:
+            finished(plan['observations'], plan['reason'])
+        except Exception as e:
+            return self._crashed("plan_finished", e)
+        if self._call_seconds is not None:
+            self._call_seconds['plan_finished'].observe(time.perf_counter() - started)
+        return self._check_memory()
+
     def _fail_game(self, error_message):
         """Handles a disqualification and returns a zero-score summary."""
         print(f"\n--- AGENT DISQUALIFIED ---")
@@ -72,14 +330,35 @@ class GameRunner:
         summary['error'] = error_message
         return summary
 
+    def _is_id(self, value):
+        """Whether ``value`` can name a node or color: anything, or exactly an int in "ids" mode."""
+        return self.game.id_table is None or type(value) is int
+
+    def _node_name(self, node):
+        """The level's name for ``node`` as the agent gave it (an ID in "ids" observation mode)."""
+        table = self.game.id_table
+        if table is None or type(node) is not int or not 0 <= node < len(table):
+            return node
+        return table.name(node)
+
+    def _color_name(self, color):
+        table = self.game.id_table
+        if table is None or type(color) is not int or not 0 <= color < len(table.colors):
+            return color
+        return table.color(color)
+
+    def _decoded(self, color_action):
+        """(node, color) of a validated color action, as names."""
+        return self._node_name(color_action['node']), self._color_name(color_action['color'])
+
     def _validate_move(self, action, state):
         """Validates a 'move' action."""
         if not isinstance(action, dict) or action.get('action') != 'move':
             return False, "Action must be a dictionary {'action': 'move', 'node': 'NODE_ID'}."
         node = action.get('node')
         # --- THE FIX: Access the nested 'nodes' list ---
-        if node not in state['visible_graph']['nodes']:
-            return False, f"Cannot move to node '{node}' as it is not currently visible."
+        if not self._is_id(node) or node not in state['visible_graph']['nodes']:
+            return False, f"Cannot move to node '{self._node_name(node)}' as it is not currently visible."
         return True, "OK"
 
     def _validate_color(self, action, state):
@@ -88,67 +367,192 @@ class GameRunner:
             return False, "Action must be a dictionary {'action': 'color', 'node': 'NODE_ID', 'color': 'COLOR'}."
         node = action.get('node')
         color = action.get('color')
-        if node != state['current_node']:
-            return False, f"Can only color the current node '{state['current_node']}', not '{node}'."
-        if color not in state['available_colors']:
-            return False, f"Color '{color}' is not valid for this level."
+        if not self._is_id(node) or node != state['current_node']:
+            return False, (f"Can only color the current node '{self._node_name(state['current_node'])}', "
+                           f"not '{self._node_name(node)}'.")
+        if not self._is_id(color) or color not in state['available_colors']:
+            return False, f"Color '{self._color_name(color)}' is not valid for this level."
         return True, "OK"
 
-if __name__ == "__main__":
-    level_file = "level6.json"
-    level_data = {
-  "graph": {
-    "nodes": [
-      "N1",
-      "N2",
-      "N3",
-      "N4",
-      "N5",
-      "N6"
-    ],
-    "edges": [
-      [
-        "N1",
-        "N2"
-      ],
-      [
-        "N2",
-        "N3"
-      ],
-      [
-        "N3",
-        "N4"
-      ],
-      [
-        "N2",
-        "N5"
-      ],
-      [
-        "N3",
-        "N6"
-      ],
-      [
-        "N5",
-        "N6"
-      ]
-    ]
-  },
-  "pre_colored": {
-    "N1": "Red"
-  },
-  "colors": [
-    "Red",
-    "Green",
-    "Blue"
-  ],
-  "start_node": "N2",
-  "visibility_radius": 1
-}
-    #with open(level_file, 'w') as f: json.dump(level_data, f)
-
-    runner = GameRunner(level_file, B22EE088)  # Change to B22CH032 or B22EE088 as needed
-    final_summary = runner.run_game()
-
-    print("\n" + "="*20 + " FINAL SUMMARY " + "="*20)
-    print(json.dumps(final_summary, indent=2))
+def run_one(level_file, agent_name, seed=None, quiet=False, engine_options=None,
+            cache_dir=None, memory=None, memory_limit=None, metrics=None,
+            early_termination=False):
+    """
+    Play one game of ``agent_name`` (resolved through the agent registry) on
+    ``level_file`` and return its summary together with the run parameters.
+    With ``cache_dir`` a reproducible game already played is answered from the
+    result cache (see ``result_cache``) instead of being replayed; games that
+    measure memory always run. ``metrics`` records the game (see ``metrics``);
+    ``early_termination`` ends doomed games early (see ``GameRunner``).
+    """
+    agent_class = default_registry.get(agent_name)
+    cache = key = None
+    measured = memory is not None or memory_limit is not None
+    if cache_dir is not None and not measured:
+        from result_cache import ResultCache
+        cache = ResultCache(cache_dir)
+        key, reason = cache.key(agent_class, level_file, seed, engine_options,
+                                early_termination)
+        if key is None and not quiet:
+            print(f"Result cache bypassed for {agent_name}: {reason}")
+    start = time.perf_counter()
+    summary = cache.get(key) if key is not None else None
+    cached = summary is not None
+    if not cached:
+        sink = open(os.devnull, "w") if quiet else None
+        try:
+            with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+                if seed is not None:
+                    random.seed(seed)
+                runner = GameRunner(level_file, agent_class, engine_options,
+                                    memory=memory, memory_limit=memory_limit,
+                                    metrics=metrics, agent_name=agent_name,
+                                    early_termination=early_termination)
+                summary = runner.run_game()
+        finally:
+            if sink is not None:
+                sink.close()
+        if key is not None:
+            cache.put(key, summary)
+    elif metrics is not None:
+        metrics.game_finished(agent_name, summary, None, 0)  # not played: no wall time to observe
+    summary.update(level=level_file, agent=agent_name, seed=seed, cached=cached,
+                   seconds=round(time.perf_counter() - start, 4))
+    return summary
+
+
+def _run_one_with_metrics(*args, **kwargs):
+    """``run_one`` in a worker process: (summary, snapshot of the game's metrics)."""
+    from metrics import TournamentMetrics
+    metrics = TournamentMetrics()
+    summary = run_one(*args, metrics=metrics, **kwargs)
+    return summary, metrics.registry.snapshot()
+
 
+def _expand_levels(patterns):
+    levels = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise SystemExit(f"No level matches '{pattern}'.")
+        levels.extend(m for m in matches if m not in levels)
+    return levels
+
+
+def _expand_agents(patterns):
+    agents = []
+    for pattern in patterns:
+        matches = default_registry.match([pattern]) or ([pattern] if ":" in pattern else [])
+        if not matches:
+            raise SystemExit(f"No agent matches '{pattern}'. "
+                             f"Known agents: {', '.join(default_registry.names())}")
+        agents.extend(m for m in matches if m not in agents)
+    return agents
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run agents on levels.")
+    parser.add_argument("--levels", nargs="+", default=["level6.json"],
+                        help="level files or globs")
+    parser.add_argument("--agents", nargs="+", default=["B22EE088"],
+                        help="agent names or globs from the registry, or module:Class")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[None],
+                        help="random.seed values; one game per seed")
+    parser.add_argument("--output", help="write all summaries to this JSON file")
+    parser.add_argument("--jobs", type=int, default=1, help="parallel worker processes")
+    parser.add_argument("--quiet", action="store_true", help="hide the referee transcript")
+    parser.add_argument("--list", action="store_true", help="list known agents and exit")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="reuse summaries of identical reproducible games from DIR")
+    parser.add_argument("--memory", choices=("tracemalloc", "rss"),
+                        help="measure each agent's peak and steady-state memory")
+    parser.add_argument("--memory-limit", type=float, metavar="MIB",
+                        help="disqualify agents using more memory (rss with --jobs > 1)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve live Prometheus metrics on localhost:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="rewrite live Prometheus metrics to PATH periodically")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, metavar="SECONDS")
+    parser.add_argument("--early-termination", action="store_true",
+                        help="end games as soon as they can no longer be won")
+    parser.add_argument("--observation-mode", choices=("copy", "view", "ids"),
+                        help="how the engine hands observations to agents (see observation.py)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(default_registry.names()))
+        return []
+
+    games = [(level, agent, seed) for level in _expand_levels(args.levels)
+             for agent in _expand_agents(args.agents) for seed in args.seeds]
+    batch = len(games) > 1
+    engine_options = {"observation_mode": args.observation_mode} if args.observation_mode else None
+    quiet = args.quiet or args.jobs > 1
+    memory_limit = None if args.memory_limit is None else int(args.memory_limit * 2**20)
+    memory = args.memory
+    if memory is None and memory_limit is not None:
+        # The address space cap of rss mode is only safe in a process of its own
+        memory = "rss" if args.jobs > 1 else "tracemalloc"
+
+    metrics, exporters = None, []
+    if args.metrics_port is not None or args.metrics_file:
+        from metrics import MetricsFileDumper, MetricsServer, TournamentMetrics
+        metrics = TournamentMetrics()
+        metrics.queue_depth.labels().set(len(games))
+        if args.metrics_port is not None:
+            server = MetricsServer(metrics, args.metrics_port)
+            exporters.append(server)
+            print(f"Serving metrics on http://127.0.0.1:{server.port}/metrics", file=sys.stderr)
+        if args.metrics_file:
+            exporters.append(MetricsFileDumper(metrics, args.metrics_file, args.metrics_interval))
+
+    try:
+        if args.jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            with ProcessPoolExecutor(args.jobs) as pool:
+                run = run_one if metrics is None else _run_one_with_metrics
+                futures = {pool.submit(run, level, agent, seed, quiet, engine_options, args.cache,
+                                       memory, memory_limit,
+                                       early_termination=args.early_termination): i
+                           for i, (level, agent, seed) in enumerate(games)}
+                results = [None] * len(games)
+                for future in as_completed(futures):
+                    result = future.result()
+                    if metrics is not None:
+                        # Merged here, in the thread the exporters read from
+                        result, snapshot = result
+                        metrics.merge(snapshot)
+                        metrics.queue_depth.labels().inc(-1)
+                    results[futures[future]] = result
+        else:
+            results = []
+            for level, agent, seed in games:
+                results.append(run_one(level, agent, seed, quiet, engine_options, args.cache,
+                                       memory, memory_limit, metrics, args.early_termination))
+                if metrics is not None:
+                    metrics.queue_depth.labels().inc(-1)
+    finally:
+        for exporter in exporters:
+            exporter.close()
+
+    if batch:
+        print(f"{'level':<24} {'agent':<16} {'seed':>6} {'score':>7} {'moves':>6} {'reassign':>8}"
+              + (f" {'peak MiB':>9}" if memory else ""))
+        for r in results:
+            peak = r.get('memory', {}).get('peak_bytes', 0) / 2**20
+            print(f"{r['level']:<24} {r['agent']:<16} {str(r['seed']):>6} {r['score']:>7} "
+                  f"{r['moves']:>6} {r['reassignments']:>8}" + (f" {peak:>9.1f}" if memory else ""))
+    else:
+        print("\n" + "="*20 + " FINAL SUMMARY " + "="*20)
+        print(json.dumps(results[0], indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Evolutionary search for levels on which an agent does badly.
+
+Starting from a random level of the requested size, a (mu + lambda) search keeps
+the ``population`` worst levels found so far and derives new ones by a few
+random mutations each:
+
+- flip an edge: add one between two nodes, or remove one whose removal keeps
+  the graph connected;
+- add, remove or move a pre-colored node;
+- move the start node;
+- change the visibility radius (1 to ``max_radius``).
+
+Levels stay solvable: every individual carries a witness coloring (found with the
+reference solver's colorability check for the initial level) and edges are only
+added between nodes of different witness colors, pre-colors use the witness color.
+The node count never changes and edges are capped at ``max_edges``.
+
+Each child is played in a worker process and scored by the chosen objective:
+
+- ``time``: the agent's wall time for the game;
+- ``search_nodes``: ``search_nodes_total`` of the agent (B22CH032's backtracking);
+- ``reassignments`` and ``moves`` from the final summary.
+
+Each game has a wall-clock ``time_limit``; a game that runs over it is stopped
+and counts as the worst possible value (infinity), summarized like a
+disqualification. Levels the agent fails (an incomplete or incorrect coloring, a
+disqualification or a timeout) rank above all others whatever the objective.
+
+The worst levels found are written to ``--out`` with a ``manifest.json``
+(objective value, score, lineage), as a regression corpus that the batch runner
+can replay:
+
+    python hard_instance_miner.py --agent B22EE088 --objective reassignments --nodes 40
+    python game_runner.py --levels 'hard_instances/B22EE088_*.json' --agents B22EE088
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import signal
+import tempfile
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from agent_registry import default_registry
+from game_runner import GameRunner
+from level_generator import generate_level, write_level
+from reference_solver import check_colorable
+
+OBJECTIVES = ("time", "search_nodes", "reassignments", "moves")
+
+
+def level_key(level):
+    """Content digest of a level, to skip re-evaluating duplicates."""
+    return hashlib.sha256(json.dumps(level, sort_keys=True).encode()).hexdigest()
+
+
+def _adjacency(level):
+    adjacency = defaultdict(set)
+    for n in level["graph"]["nodes"]:
+        adjacency[n]
+    for u, v in level["graph"]["edges"]:
+        adjacency[u].add(v)
+        adjacency[v].add(u)
+    return adjacency
+
+
+def _connected_without(adjacency, u, v):
+    """Whether v is still reachable from u once the edge (u, v) is removed."""
+    seen, queue = {u}, deque([u])
+    while queue:
+        node = queue.popleft()
+        for nb in adjacency[node]:
+            if (node, nb) in ((u, v), (v, u)) or nb in seen:
+                continue
+            if nb == v:
+                return True
+            seen.add(nb)
+            queue.append(nb)
+    return False
+
+
+def mutate(level, witness, rng, max_edges, max_radius):
+    """A copy of ``level`` with one random mutation; the witness coloring stays valid."""
+    nodes = level["graph"]["nodes"]
+    edges = {tuple(e) for e in level["graph"]["edges"]}
+    pre_colored = dict(level["pre_colored"])
+    start, radius = level["start_node"], level["visibility_radius"]
+    kind = rng.choice(("edge", "edge", "edge", "pre_colored", "start", "radius"))
+
+    if kind == "edge":
+        u, v = rng.sample(nodes, 2)
+        if (u, v) in edges or (v, u) in edges:
+            edge = (u, v) if (u, v) in edges else (v, u)
+            if _connected_without(_adjacency(level), u, v):
+                edges.discard(edge)
+        elif witness[u] != witness[v] and len(edges) < max_edges:
+            edges.add((u, v))
+    elif kind == "pre_colored":
+        node = rng.choice(nodes)
+        if node in pre_colored and rng.random() < 0.5:
+            del pre_colored[node]
+        elif pre_colored and rng.random() < 0.5:
+            del pre_colored[rng.choice(sorted(pre_colored))]
+            pre_colored[node] = witness[node]
+        else:
+            pre_colored[node] = witness[node]
+    elif kind == "start":
+        start = rng.choice(nodes)
+    else:
+        radius = rng.randint(1, max_radius)
+
+    return dict(level, graph={"nodes": nodes, "edges": [list(e) for e in sorted(edges)]},
+                pre_colored=pre_colored, start_node=start, visibility_radius=radius)
+
+
+class _Timeout(BaseException):
+    """Ends a game over its time limit (not an Exception, so agents cannot swallow it)."""
+
+
+def _alarm(signum, frame):
+    raise _Timeout()
+
+
+def evaluate(level, agent_name, objective, seed=0, time_limit=None):
+    """
+    (objective value, final summary) of ``agent_name`` playing ``level``. A game
+    still running after ``time_limit`` seconds is stopped (where SIGALRM exists)
+    and scores infinity.
+    """
+    agent_class = default_registry.get(agent_name)
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    runner = None
+    timed = time_limit is not None and hasattr(signal, "setitimer")
+    try:
+        write_level(level, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            random.seed(seed)
+            if timed:
+                previous = signal.signal(signal.SIGALRM, _alarm)
+                signal.setitimer(signal.ITIMER_REAL, time_limit)
+            try:
+                runner = GameRunner(path, agent_class)
+                start = time.perf_counter()
+                summary = runner.run_game()
+                elapsed = time.perf_counter() - start
+            finally:
+                if timed:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                    signal.signal(signal.SIGALRM, previous)
+    except _Timeout:
+        game = runner.game if runner is not None else None
+        return float("inf"), {"score": 0, "is_correct": False,
+                              "error": f"Timed out after {time_limit} s",
+                              "moves": game.moves if game else 0,
+                              "reassignments": game.reassignments if game else 0}
+    finally:
+        os.remove(path)
+    if objective == "time":
+        value = elapsed
+    elif objective == "search_nodes":
+        value = getattr(runner.agent, "search_nodes_total", 0)
+    else:
+        value = summary[objective]
+    return value, summary
+
+
+def _evaluate_job(job):
+    return evaluate(*job)
+
+
+class HardInstanceMiner:
+    """(mu + lambda) search maximizing an agent's cost over levels of a fixed size."""
+    def __init__(self, agent_name, objective="reassignments", nodes=40, degree=3.0,
+                 colors=3, max_edges=None, max_radius=3, population=8, children=16,
+                 jobs=None, seed=0, time_limit=60.0):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}'. Choose from {OBJECTIVES}.")
+        self.agent_name = agent_name
+        self.objective = objective
+        self.nodes = nodes
+        self.degree = degree
+        self.colors = colors
+        self.max_edges = max_edges or 3 * nodes
+        self.max_radius = max_radius
+        self.population_size = population
+        self.children = children
+        self.jobs = jobs or os.cpu_count()
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.time_limit = time_limit
+        self.population = []   # [{"level", "witness", "value", "summary", "lineage"}], worst first
+        self.evaluations = 0
+        self._seen = set()
+
+    def _initial(self):
+        level = generate_level(self.nodes, self.degree, self.colors, seed=self.seed)
+        status, witness = check_colorable(_adjacency(level), level["colors"], level["pre_colored"])
+        if status != "sat":  # generated levels are solvable, but the check may give up
+            raise RuntimeError("Could not find a coloring of the initial level.")
+        return level, dict(level["pre_colored"], **witness)
+
+    def _add(self, pool, candidates):
+        jobs = [(c["level"], self.agent_name, self.objective, self.seed, self.time_limit)
+                for c in candidates]
+        for candidate, (value, summary) in zip(candidates, pool.map(_evaluate_job, jobs)):
+            candidate.update(value=value, summary=summary)
+            self.evaluations += 1
+        # Every level is solvable, so a failed game is worse than any objective value
+        self.population = sorted(self.population + candidates,
+                                 key=lambda c: (c["summary"]["is_correct"],
+                                                -c["value"]))[:self.population_size]
+
+    def run(self, generations=20, report=print):
+        level, witness = self._initial()
+        self._seen.add(level_key(level))
+        with ProcessPoolExecutor(self.jobs) as pool:
+            self._add(pool, [{"level": level, "witness": witness, "lineage": []}])
+            for generation in range(1, generations + 1):
+                children = []
+                for _ in range(self.children * 4):  # duplicates are skipped, so try a few times
+                    if len(children) == self.children:
+                        break
+                    # Parents near the top of the population are picked more often
+                    parent = self.population[int(self.rng.random() ** 2 * len(self.population))]
+                    child = parent["level"]
+                    for _ in range(self.rng.randint(1, 3)):
+                        child = mutate(child, parent["witness"], self.rng,
+                                       self.max_edges, self.max_radius)
+                    key = level_key(child)
+                    if key in self._seen:
+                        continue
+                    self._seen.add(key)
+                    children.append({"level": child, "witness": parent["witness"],
+                                     "lineage": parent["lineage"] + [generation]})
+                if children:
+                    self._add(pool, children)
+                best = self.population[0]
+                failed = sum(not c["summary"]["is_correct"] for c in self.population)
+                report(f"generation {generation}: worst {self.objective} = {best['value']:.4g}, "
+                       f"{failed} failed "
+                       f"(score {best['summary']['score']}, {self.evaluations} evaluations)")
+        return self.population
+
+    def save(self, directory, top=None):
+        """Write the worst levels and a manifest to ``directory``; returns the level paths."""
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, "manifest.json")
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        paths = []
+        for rank, entry in enumerate(self.population[:top]):
+            name = f"{self.agent_name}_{self.objective}_{level_key(entry['level'])[:12]}.json"
+            write_level(entry["level"], os.path.join(directory, name))
+            manifest[name] = {
+                "agent": self.agent_name,
+                "objective": self.objective,
+                "value": entry["value"],
+                "score": entry["summary"]["score"],
+                "moves": entry["summary"]["moves"],
+                "reassignments": entry["summary"]["reassignments"],
+                "miner_seed": self.seed,
+                "generations": entry["lineage"],
+            }
+            paths.append(os.path.join(directory, name))
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True, default=str)
+        return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search for levels an agent handles badly.")
+    parser.add_argument("--agent", default="B22CH032")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="reassignments")
+    parser.add_argument("--nodes", type=int, default=40, help="size budget (node count)")
+    parser.add_argument("--degree", type=float, default=3.0, help="initial average degree")
+    parser.add_argument("--colors", type=int, default=3)
+    parser.add_argument("--max-edges", type=int, default=None, help="default 3 * nodes")
+    parser.add_argument("--max-radius", type=int, default=3)
+    parser.add_argument("--population", type=int, default=8)
+    parser.add_argument("--children", type=int, default=16, help="new levels per generation")
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=60.0,
+                        help="seconds per game; longer games count as the worst value")
+    parser.add_argument("--out", default="hard_instances")
+    parser.add_argument("--top", type=int, default=5, help="levels to save")
+    args = parser.parse_args()
+
+    miner = HardInstanceMiner(args.agent, args.objective, args.nodes, args.degree, args.colors,
+                              args.max_edges, args.max_radius, args.population, args.children,
+                              args.jobs, args.seed, args.time_limit)
+    miner.run(args.generations)
+    for path in miner.save(args.out, args.top):
+        print(f"Saved {path}")
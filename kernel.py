@@ -0,0 +1,130 @@
+"""
+Low-degree kernelization for the agents' exact search.
+
+An unassigned node whose unassigned neighbors plus distinct colors among its
+assigned neighbors number fewer than k (the number of colors) can always be
+colored after everything else: whatever its neighbors get, a color is left. Such
+nodes are stripped one at a time, which may make their neighbors strippable in
+turn; the search then only has to solve the remaining core, and the stripped
+nodes are colored greedily in reverse stripping order. On sparse levels most of
+the known graph peels away.
+
+The peeling is kept across planning turns instead of being redone. A stripped
+node stays valid as long as the nodes it still counts (the core and nodes
+stripped after it) and its neighbors' colors leave it a free color. Each update
+finds what changed since the last one: nodes that joined or left the unassigned
+set, assigned nodes whose color changed, and edges reported by ``edge_added``.
+Only the stripped nodes next to a change are checked again. One that no longer
+fits goes back to the core, which re-checks the nodes stripped after it, and
+core nodes next to a change are tried for stripping.
+"""
+INF = float("inf")
+
+
+class LowDegreeKernel:
+    """Incrementally maintained peeling of the unassigned nodes into core + stripped."""
+    def __init__(self, adjacency, num_colors):
+        self.adjacency = adjacency  # held by reference, like the agents' other indexes
+        self.k = num_colors
+        self.core = set()
+        self.rank = {}      # stripped node -> position in the stripping order
+        self._next_rank = 0
+        self._colors = {}   # colors of the assigned neighbors seen at the last update
+        self._dirty = set()
+        self.updates = 0
+        self.variables_total = 0
+        self.core_total = 0
+
+    def edge_added(self, u, v):
+        self._dirty.add(u)
+        self._dirty.add(v)
+
+    def _fits(self, node, assignment, rank=INF):
+        """Whether ``node`` stripped at ``rank`` always has a color left."""
+        remaining = 0
+        colors = set()
+        for n in self.adjacency[node]:
+            color = assignment.get(n)
+            if color is not None:
+                colors.add(color)
+            elif n in self.core and n != node or self.rank.get(n, -1) > rank:
+                remaining += 1
+        return remaining + len(colors) < self.k
+
+    def update(self, unassigned, assignment):
+        """Bring the peeling up to date with ``unassigned`` nodes under ``assignment``."""
+        dirty = self._dirty
+        adjacency = self.adjacency
+        for node in [n for n in self.core if n not in unassigned]:
+            self.core.discard(node)
+            dirty.update(adjacency[node])
+        for node in [n for n in self.rank if n not in unassigned]:
+            del self.rank[node]
+            dirty.update(adjacency[node])
+        for node in unassigned:
+            if node not in self.core and node not in self.rank:
+                self.core.add(node)
+                dirty.add(node)
+                dirty.update(adjacency[node])
+
+        # Assigned nodes whose color changed (or that became or stopped being assigned)
+        colors = {n: c for n, c in assignment.items() if c is not None}
+        for node, color in colors.items():
+            if self._colors.get(node) != color:
+                dirty.update(adjacency[node])
+        for node in self._colors:
+            if node not in colors:
+                dirty.update(adjacency[node])
+        self._colors = colors
+
+        # Stripped nodes that lost their spare color go back to the core
+        check = [n for n in dirty if n in self.rank]
+        while check:
+            node = check.pop()
+            rank = self.rank.get(node)
+            if rank is None or self._fits(node, assignment, rank):
+                continue
+            del self.rank[node]
+            self.core.add(node)
+            dirty.add(node)
+            check.extend(n for n in adjacency[node] if self.rank.get(n, -1) > rank)
+
+        # Strip what now can be, appending to the order
+        queue = [n for n in dirty if n in self.core]
+        while queue:
+            node = queue.pop()
+            if node not in self.core or not self._fits(node, assignment):
+                continue
+            self.core.discard(node)
+            self.rank[node] = self._next_rank
+            self._next_rank += 1
+            queue.extend(n for n in adjacency[node] if n in self.core)
+        dirty.clear()
+
+        self.updates += 1
+        self.variables_total += len(unassigned)
+        self.core_total += len(self.core)
+        return self.core
+
+    def stripped(self):
+        """Stripped nodes in the order to color them (reverse stripping order)."""
+        return sorted(self.rank, key=self.rank.get, reverse=True)
+
+    def color_stripped(self, assignment, colors, order_values=None):
+        """
+        Greedily color the stripped nodes in reverse order, in place; returns them.
+        ``order_values(node, assignment, pending)`` may rank the colors to try
+        (e.g. least constraining first) given the still ``pending`` stripped nodes.
+        """
+        stripped = self.stripped()
+        pending = set(stripped)
+        for node in stripped:
+            pending.discard(node)
+            used = {assignment.get(n) for n in self.adjacency[node]}
+            ranked = order_values(node, assignment, pending) if order_values else colors
+            assignment[node] = next((c for c in ranked if c not in used), None)
+        return stripped
+
+    def stats(self):
+        return {"updates": self.updates, "core": len(self.core), "stripped": len(self.rank),
+                "mean_core_fraction": self.core_total / max(1, self.variables_total)}
@@ -0,0 +1,203 @@
+"""
+Compact knowledge base for agents: the part of the level seen so far.
+
+Node names are interned to consecutive ints on first sight; adjacency, colors and
+per-node neighbor color counts live in ``array`` storage indexed by those ints
+instead of dicts and sets of strings. Merging an observation touches only the
+observation itself, so its cost does not grow with the known graph.
+
+Both agents merge every observation here first and feed what the merge reports
+as new into the name-keyed ``adjacency`` that their navigation, frontier, kernel
+and routing indexes share, so the edge set and color counts are kept once:
+
+    graph = KnownGraph(initial_state['available_colors'])
+    result = graph.merge(visible_state)
+    for a, b in result.new_edges: ...  # ids; graph.names[a] is the node name
+    graph.domain('V3'), graph.saturation('V3'), graph.frontier()
+
+``bench_known_graph_memory.py`` measures the memory per known node.
+"""
+from array import array
+
+from observation import edge_pairs
+
+UNCOLORED = -1
+
+
+class MergeResult:
+    """What one ``merge`` added: new node ids, new (u, v) id pairs and recolored ids."""
+    __slots__ = ("new_nodes", "new_edges", "recolored")
+
+    def __init__(self):
+        self.new_nodes = []
+        self.new_edges = []
+        self.recolored = []
+
+
+class KnownGraph:
+    """
+    Interned, array-backed adjacency and coloring of the known graph. ``colors``
+    is the palette the counts cover; other colors (found on pre-colored nodes) are
+    appended to ``self.colors`` as they are seen and never counted.
+    """
+    __slots__ = ("colors", "color_ids", "k", "ids", "names", "adjacency", "color",
+                 "_counts", "_free", "_zero_row", "_explored", "_frontier", "edge_count")
+
+    def __init__(self, colors):
+        self.colors = list(colors)
+        self.color_ids = {c: i for i, c in enumerate(self.colors)}
+        self.k = len(self.colors)
+        self.ids = {}                 # node name -> id
+        self.names = []               # id -> node name
+        self.adjacency = []           # id -> array('i') of neighbor ids
+        self.color = array('h')       # id -> color id or UNCOLORED
+        self._counts = array('I')     # id * k + c -> neighbors of id holding color c
+        self._free = array('I')       # id -> palette colors no neighbor of id holds
+        self._zero_row = array('I', [0] * self.k)
+        self._explored = bytearray()  # 1 once the node's whole neighborhood was observed
+        self._frontier = set()        # ids of known, unexplored nodes
+        self.edge_count = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    # -- interning and updates -------------------------------------------------
+
+    def intern(self, name, result=None):
+        """Id of ``name``, adding the node if it is new."""
+        i = self.ids.get(name)
+        if i is None:
+            i = len(self.names)
+            self.ids[name] = i
+            self.names.append(name)
+            self.adjacency.append(array('i'))
+            self.color.append(UNCOLORED)
+            self._counts.extend(self._zero_row)
+            self._free.append(self.k)
+            self._explored.append(0)
+            self._frontier.add(i)
+            if result is not None:
+                result.new_nodes.append(i)
+        return i
+
+    def color_id(self, color):
+        """Id of ``color`` (None clears), adding it past the palette if it is new."""
+        if color is None:
+            return UNCOLORED
+        c = self.color_ids.get(color)
+        if c is None:
+            c = self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        return c
+
+    def _bump(self, i, c, delta):
+        if c == UNCOLORED or c >= self.k:
+            return
+        slot = i * self.k + c
+        if self._counts[slot] == 0:
+            self._free[i] -= 1
+        self._counts[slot] += delta
+        if self._counts[slot] == 0:
+            self._free[i] += 1
+
+    def add_edge(self, u, v):
+        """Add the edge between ids u and v; returns False if it was already known."""
+        adj_u, adj_v = self.adjacency[u], self.adjacency[v]
+        # Scan the shorter neighbor array: O(min degree)
+        if u == v or (v in adj_u if len(adj_u) <= len(adj_v) else u in adj_v):
+            return False
+        adj_u.append(v)
+        adj_v.append(u)
+        self.edge_count += 1
+        self._bump(v, self.color[u], 1)
+        self._bump(u, self.color[v], 1)
+        return True
+
+    def set_color(self, i, color_id):
+        """Color node id ``i`` (UNCOLORED clears it), keeping neighbor counts in O(degree)."""
+        old = self.color[i]
+        if old == color_id:
+            return False
+        self.color[i] = color_id
+        bump = self._bump
+        for j in self.adjacency[i]:
+            bump(j, old, -1)
+            bump(j, color_id, 1)
+        return True
+
+    def mark_explored(self, i):
+        self._explored[i] = 1
+        self._frontier.discard(i)
+
+    def merge(self, visible_state):
+        """
+        Merge an observation in O(observation). The current node's neighborhood is
+        fully visible, so it leaves the frontier. Returns a ``MergeResult``.
+        """
+        result = MergeResult()
+        intern = self.intern
+        graph = visible_state['visible_graph']
+        for name in graph['nodes']:
+            intern(name, result)
+        ids = self.ids
+        for u, v in edge_pairs(graph['edges']):
+            a, b = ids[u], ids[v]
+            if self.add_edge(a, b):
+                result.new_edges.append((a, b))
+        for name, c in visible_state['node_colors'].items():
+            if c is not None:
+                i = ids[name]
+                if self.set_color(i, self.color_id(c)):
+                    result.recolored.append(i)
+        self.mark_explored(ids[visible_state['current_node']])
+        return result
+
+    # -- queries (by node name) --------------------------------------------------
+
+    def color_of(self, name):
+        c = self.color[self.ids[name]]
+        return None if c == UNCOLORED else self.colors[c]
+
+    def neighbors(self, name):
+        names = self.names
+        return [names[j] for j in self.adjacency[self.ids[name]]]
+
+    def count(self, name, color):
+        """Known neighbors of ``name`` holding ``color`` (0 for colors off the palette; O(1))."""
+        c = self.color_ids.get(color)
+        if c is None or c >= self.k:
+            return 0
+        return self._counts[self.ids[name] * self.k + c]
+
+    def free_count(self, name):
+        """Number of palette colors no known neighbor of ``name`` holds (O(1))."""
+        return self._free[self.ids[name]]
+
+    def domain(self, name):
+        """Colors no known neighbor of ``name`` holds (O(k))."""
+        base = self.ids[name] * self.k
+        counts = self._counts
+        return [c for x, c in enumerate(self.colors[:self.k]) if counts[base + x] == 0]
+
+    def saturation(self, name):
+        """Number of distinct palette colors among the known neighbors of ``name`` (O(1))."""
+        return self.k - self._free[self.ids[name]]
+
+    def uncolored_neighbors(self, name):
+        names, color = self.names, self.color
+        return [names[j] for j in self.adjacency[self.ids[name]] if color[j] == UNCOLORED]
+
+    def uncolored(self):
+        names = self.names
+        return [names[i] for i, c in enumerate(self.color) if c == UNCOLORED]
+
+    def frontier(self):
+        """Known nodes whose neighborhoods have not been fully observed yet."""
+        names = self.names
+        return [names[i] for i in self._frontier]
+
+    def is_explored(self, name):
+        return bool(self._explored[self.ids[name]])
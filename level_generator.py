@@ -0,0 +1,75 @@
+"""
+Random level generator for benchmarks and stress tests.
+
+Levels are connected and always solvable: every node gets a hidden color first
+and edges are only drawn between nodes of different hidden colors. Some nodes can
+be pre-colored with their hidden color.
+
+    python level_generator.py 1000 --degree 4 --radius 2 --seed 7 -o big.json
+"""
+import argparse
+import json
+import random
+
+
+def generate_level(num_nodes, avg_degree=3.0, num_colors=3, visibility_radius=1,
+                   precolored=0, seed=None):
+    """Return a level dict in the same format as the shipped level JSON files."""
+    rng = random.Random(seed)
+    colors = ["Red", "Green", "Blue", "Yellow", "Purple", "Orange", "Cyan", "Pink"]
+    if num_colors > len(colors):
+        colors += [f"Color{i}" for i in range(len(colors), num_colors)]
+    colors = colors[:num_colors]
+    names = [f"V{i}" for i in range(num_nodes)]
+    hidden = [rng.randrange(num_colors) for _ in range(num_nodes)]
+
+    edges = set()
+    # Random spanning tree keeps the level connected
+    for i in range(1, num_nodes):
+        j = rng.randrange(i)
+        if hidden[j] == hidden[i] and num_colors > 1:
+            hidden[i] = (hidden[j] + 1 + rng.randrange(num_colors - 1)) % num_colors
+        edges.add((j, i))
+
+    target = max(len(edges), int(num_nodes * avg_degree / 2))
+    attempts = 0
+    while len(edges) < target and attempts < 20 * target:
+        attempts += 1
+        u, v = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if u != v and hidden[u] != hidden[v]:
+            edges.add((min(u, v), max(u, v)))
+
+    pre_colored = {}
+    for i in rng.sample(range(num_nodes), min(precolored, num_nodes)):
+        pre_colored[names[i]] = colors[hidden[i]]
+
+    return {
+        "graph": {
+            "nodes": names,
+            "edges": [[names[u], names[v]] for u, v in sorted(edges)],
+        },
+        "pre_colored": pre_colored,
+        "colors": colors,
+        "start_node": names[rng.randrange(num_nodes)],
+        "visibility_radius": visibility_radius,
+    }
+
+
+def write_level(level, path):
+    with open(path, "w") as f:
+        json.dump(level, f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a random solvable level.")
+    parser.add_argument("nodes", type=int)
+    parser.add_argument("--degree", type=float, default=3.0, help="average degree")
+    parser.add_argument("--colors", type=int, default=3)
+    parser.add_argument("--radius", type=int, default=1, help="visibility radius")
+    parser.add_argument("--precolored", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", default="generated_level.json")
+    args = parser.parse_args()
+    write_level(generate_level(args.nodes, args.degree, args.colors, args.radius,
+                               args.precolored, args.seed), args.output)
+    print(f"Wrote {args.output}")
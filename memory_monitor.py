@@ -0,0 +1,148 @@
+"""
+Memory accounting and limits for one game's agent.
+
+``GameRunner`` starts a monitor before it constructs the agent, samples it after
+every agent call and reports, in the summary's ``memory`` entry, the peak and
+the steady-state (still held when the game ends) memory in bytes, both relative
+to the baseline taken just before the agent was built. Two modes:
+
+- ``"tracemalloc"``: Python allocations traced in-process. Precise (the peak
+  includes allocations freed within a call) but slows the game down a few times.
+  A limit is checked after each call, so one call can overshoot it before the
+  agent is stopped.
+- ``"rss"``: resident set size of the process, for games that run in worker
+  processes. With a limit the process address space is also capped
+  (``RLIMIT_AS``) while the agent is built and while the game is played, and
+  lifted in between (``suspend``/``resume``), so an allocation past the limit
+  raises ``MemoryError`` inside the agent and it is stopped immediately. The cap
+  is process-wide; use it only where a game has the process to itself.
+
+Both modes measure the whole process, not the agent alone: whatever the engine
+allocates during the game (balls and views it caches lazily, the ID table) is
+charged to the agent too. Compare agents with the same engine options, and
+precompute or bound the engine's caches when the difference matters.
+
+An agent over its limit is disqualified with a message naming the limit.
+"""
+import os
+import tracemalloc
+
+MODES = ("tracemalloc", "rss")
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _statm():
+    """(virtual size, resident size) of this process in bytes, or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            size, resident = f.read().split()[:2]
+    except OSError:
+        return None
+    page = os.sysconf("SC_PAGE_SIZE")
+    return int(size) * page, int(resident) * page
+
+
+def _max_rss():
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+
+
+def _rss():
+    statm = _statm()
+    return statm[1] if statm else _max_rss()
+
+
+class MemoryMonitor:
+    """Peak and steady-state memory of a game relative to a baseline, with an optional limit."""
+    def __init__(self, mode="tracemalloc", limit_bytes=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown memory mode '{mode}'. Choose from {MODES}.")
+        self.mode = mode
+        self.limit_bytes = limit_bytes
+        self.baseline = 0
+        self.peak = 0
+        self.current = 0
+        self.running = False
+        self._owns_tracing = False
+        self._max_rss_start = 0
+        self._saved_limit = None
+        self._cap = None  # RLIMIT_AS soft limit in rss mode with a limit
+
+    def start(self):
+        if self.mode == "tracemalloc":
+            self._owns_tracing = not tracemalloc.is_tracing()
+            if self._owns_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.baseline = tracemalloc.get_traced_memory()[0]
+        else:
+            self.baseline = _rss()
+            self._max_rss_start = _max_rss()
+            statm = _statm()
+            if self.limit_bytes is not None and resource is not None and statm:
+                self._cap = statm[0] + self.limit_bytes
+                self.resume()
+        self.running = True
+
+    def resume(self):
+        """Apply the rss mode address space cap (again)."""
+        if self._cap is None or self._saved_limit is not None:
+            return
+        self._saved_limit = resource.getrlimit(resource.RLIMIT_AS)
+        hard = self._saved_limit[1]
+        cap = self._cap if hard == resource.RLIM_INFINITY else min(self._cap, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, hard))
+
+    def suspend(self):
+        """Lift the address space cap until ``resume``; measurements continue."""
+        if self._saved_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, self._saved_limit)
+            self._saved_limit = None
+
+    def sample(self):
+        """Update the measurements; returns a disqualification message if over the limit."""
+        if not self.running:
+            return None
+        if self.mode == "tracemalloc":
+            current, peak = tracemalloc.get_traced_memory()
+            self.current = current - self.baseline
+            self.peak = max(self.peak, peak - self.baseline)
+        else:
+            self.current = _rss() - self.baseline
+            self.peak = max(self.peak, self.current)
+            max_rss = _max_rss()
+            if max_rss > self._max_rss_start:  # a new process-wide high during this game
+                self.peak = max(self.peak, max_rss - self.baseline)
+        if self.limit_bytes is not None and self.peak > self.limit_bytes:
+            return self.exceeded()
+        return None
+
+    def exceeded(self, where=None):
+        """Disqualification message; ``where`` names the call in which an allocation failed."""
+        limit = f"{self.limit_bytes / 2**20:.1f} MiB" if self.limit_bytes is not None else None
+        if where is None:
+            return (f"Memory limit exceeded: agent used {self.peak / 2**20:.1f} MiB, "
+                    f"limit is {limit} ({self.mode}).")
+        if limit is None:
+            return f"Agent ran out of memory in {where}."
+        return f"Memory limit exceeded in {where}: an allocation failed under the {limit} cap ({self.mode})."
+
+    def stop(self):
+        if not self.running:
+            return
+        self.sample()
+        self.running = False
+        if self.mode == "tracemalloc":
+            if self._owns_tracing:
+                tracemalloc.stop()
+        else:
+            self.suspend()
+
+    def report(self):
+        return {"mode": self.mode, "peak_bytes": self.peak, "steady_bytes": self.current,
+                "limit_bytes": self.limit_bytes}
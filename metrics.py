@@ -0,0 +1,260 @@
+"""
+Live tournament metrics in the Prometheus text format.
+
+``TournamentMetrics`` holds the counters a long batch run exposes while it runs:
+
+- ``colour_me_games_completed_total{agent}`` and
+  ``colour_me_disqualifications_total{agent}``;
+- ``colour_me_steps_total{agent}`` and the ``colour_me_steps_per_second`` gauge
+  (steps over wall time since the metrics were created);
+- ``colour_me_agent_call_seconds{call}``: latency histogram of the agent's
+  ``move``, ``color`` and ``plan_finished`` calls;
+- ``colour_me_game_seconds``: histogram of whole games;
+- ``colour_me_queue_depth``: games scheduled but not finished.
+
+``GameRunner(metrics=...)`` records into it; the per-step cost is a clock read
+and one histogram bucket increment per agent call. Games played in worker
+processes record into their own instance, whose ``snapshot()`` is merged into
+the parent's on completion.
+
+They are published either over HTTP on localhost or by rewriting a file
+periodically (for node-exporter's textfile collector, or just ``cat``):
+
+    python game_runner.py --levels 'level*.json' --agents '*' --jobs 4 --metrics-port 9108
+    python game_runner.py --levels 'level*.json' --agents '*' --metrics-file metrics.prom
+"""
+import bisect
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = (1e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+GAME_BUCKETS = (0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A named family of values, one per combination of label values."""
+    def __init__(self, kind, name, help, labels=(), buckets=None):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets) if buckets else None
+        self.children = {}
+
+    def labels(self, *values):
+        """The child for ``values`` (bind it once, then call inc/set/observe on it)."""
+        child = self.children.get(values)
+        if child is None:
+            child = _Buckets(self.buckets) if self.kind == "histogram" else _Value()
+            self.children[values] = child
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        # Copied first: the server thread renders while the runner adds children
+        for values, child in sorted(list(self.children.items())):
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_format_labels(self.label_names, values)} "
+                             f"{_number(child.value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, values, [("le", _number(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{labels} {_number(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics, rendered together."""
+    def __init__(self):
+        self.metrics = {}
+
+    def _add(self, kind, name, help, labels=(), buckets=None):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Metric(kind, name, help, labels, buckets)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._add("counter", name, help, labels)
+
+    def gauge(self, name, help, labels=()):
+        return self._add("gauge", name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add("histogram", name, help, labels, buckets)
+
+    def render(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Counter and histogram values as plain data, for merging across processes."""
+        data = {}
+        for name, metric in self.metrics.items():
+            if metric.kind == "gauge":
+                continue
+            data[name] = [(values, (child.counts, child.sum, child.count)
+                           if metric.kind == "histogram" else child.value)
+                          for values, child in list(metric.children.items())]
+        return data
+
+    def merge(self, snapshot):
+        """Add another registry's ``snapshot()`` (same metric definitions) into this one."""
+        for name, children in snapshot.items():
+            metric = self.metrics[name]
+            for values, state in children:
+                child = metric.labels(*values)
+                if metric.kind == "histogram":
+                    counts, total, count = state
+                    child.counts = [a + b for a, b in zip(child.counts, counts)]
+                    child.sum += total
+                    child.count += count
+                else:
+                    child.inc(state)
+
+
+class TournamentMetrics:
+    """The runner's metrics (see the module docstring) on a ``MetricsRegistry``."""
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.games = r.counter("colour_me_games_completed_total", "Games finished.", ["agent"])
+        self.disqualifications = r.counter("colour_me_disqualifications_total",
+                                           "Games that ended in a disqualification.", ["agent"])
+        self.steps = r.counter("colour_me_steps_total", "Referee steps played.", ["agent"])
+        self.call_seconds = r.histogram("colour_me_agent_call_seconds",
+                                        "Latency of agent calls.", ["call"])
+        self.game_seconds = r.histogram("colour_me_game_seconds", "Wall time of whole games.",
+                                        buckets=GAME_BUCKETS)
+        self.steps_per_second = r.gauge("colour_me_steps_per_second",
+                                        "Steps per second since the run started.")
+        self.queue_depth = r.gauge("colour_me_queue_depth", "Games scheduled but not finished.")
+        self.started = time.monotonic()
+
+    def game_finished(self, agent, summary, seconds, steps):
+        """Count a finished game; ``seconds=None`` (a cached result) skips the wall time."""
+        self.games.labels(agent).inc()
+        if summary.get("error"):
+            self.disqualifications.labels(agent).inc()
+        self.steps.labels(agent).inc(steps)
+        if seconds is not None:
+            self.game_seconds.labels().observe(seconds)
+        self.update_rate()
+
+    def update_rate(self):
+        total = sum(child.value for child in self.steps.children.values())
+        self.steps_per_second.labels().set(total / max(1e-9, time.monotonic() - self.started))
+
+    def merge(self, snapshot):
+        self.registry.merge(snapshot)
+        self.update_rate()
+
+    def render(self):
+        return self.registry.render()
+
+
+class MetricsServer:
+    """Serves ``render()`` at http://host:port/metrics from a daemon thread."""
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # keep the runner's output clean
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsFileDumper:
+    """Rewrites ``path`` with ``render()`` every ``interval`` seconds and on close."""
+    def __init__(self, metrics, path, interval=15.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def dump(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.metrics.render())
+        os.replace(tmp, self.path)  # readers never see a partial file
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def close(self):
+        self._stop.set()
+        self.thread.join()
+        self.dump()
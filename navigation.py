@@ -0,0 +1,116 @@
+"""
+Navigation index over an agent's known graph.
+
+Shortest-path trees are kept with parent pointers instead of copied path lists.
+A tree rooted at a target answers "next hop from here" in O(1) (it is the
+parent of the current node), so a path followed over several turns costs one
+BFS in total. When an edge is discovered every cached tree is repaired
+incrementally: an edge between nodes whose depths differ by at most one cannot
+shorten any path and is ignored, otherwise only the region it improves is
+relaxed.
+"""
+from collections import OrderedDict, deque
+
+
+class _BFSTree:
+    """Distances and parents (toward the root)."""
+    __slots__ = ("root", "dist", "parent")
+
+    def __init__(self, root):
+        self.root = root
+        self.dist = {root: 0}
+        self.parent = {root: None}
+
+    def _reach(self, node, via):
+        self.dist[node] = self.dist[via] + 1
+        self.parent[node] = via
+
+    def grow(self, adjacency, queue):
+        """Relax outward from the nodes in ``queue`` whose entries were just improved."""
+        dist = self.dist
+        while queue:
+            node = queue.popleft()
+            d = dist[node] + 1
+            for neighbor in adjacency[node]:
+                known = dist.get(neighbor)
+                if known is None or known > d:
+                    self._reach(neighbor, node)
+                    queue.append(neighbor)
+
+
+class NavigationIndex:
+    """LRU cache of incrementally maintained BFS trees over ``adjacency`` (held by reference)."""
+    def __init__(self, adjacency, max_trees=64):
+        self.adjacency = adjacency
+        self.max_trees = max_trees
+        self._trees = OrderedDict()
+        self.builds = 0
+        self.repairs = 0
+        self.version = 0  # bumped on every add_edge, so callers can cache derived results
+
+    def tree(self, root):
+        tree = self._trees.get(root)
+        if tree is None:
+            tree = _BFSTree(root)
+            tree.grow(self.adjacency, deque([root]))
+            self.builds += 1
+            self._trees[root] = tree
+            if len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(root)
+        return tree
+
+    def add_edge(self, u, v):
+        """Account for an edge just added to the adjacency."""
+        self.version += 1
+        for tree in self._trees.values():
+            du, dv = tree.dist.get(u), tree.dist.get(v)
+            if du is None and dv is None:
+                continue
+            if du is None or (dv is not None and dv < du):
+                u, v, du, dv = v, u, dv, du
+            if dv is not None and dv <= du + 1:
+                continue  # cannot shorten anything
+            tree._reach(v, u)
+            tree.grow(self.adjacency, deque([v]))
+            self.repairs += 1
+
+    def distance(self, a, b):
+        """Hop distance between a and b in the known graph (None if disconnected)."""
+        return self.tree(b).dist.get(a)
+
+    def next_hop(self, start, goal):
+        """Neighbor of ``start`` on a shortest path to ``goal`` (None if there is none)."""
+        return self.tree(goal).parent.get(start)
+
+    def path(self, start, goal):
+        """Shortest path [start, ..., goal] in the known graph, or None."""
+        parent = self.tree(goal).parent
+        if start not in parent:
+            return None
+        path = [start]
+        while path[-1] != goal:
+            path.append(parent[path[-1]])
+        return path
+
+    def nearest(self, start, targets, allowed=None):
+        """
+        Closest node of ``targets`` to ``start`` and the first hop toward it, via a
+        parent-pointer BFS that stops at the first target (optionally only through
+        ``allowed`` nodes). Returns (None, None) if no target is reachable.
+        """
+        if start in targets:
+            return start, start
+        first_hop = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for neighbor in self.adjacency[node]:
+                if neighbor in first_hop or (allowed is not None and neighbor not in allowed):
+                    continue
+                first_hop[neighbor] = neighbor if node == start else first_hop[node]
+                if neighbor in targets:
+                    return neighbor, first_hop[neighbor]
+                queue.append(neighbor)
+        return None, None
@@ -0,0 +1,175 @@
+"""
+Read-only and integer-encoded observations for ``GraphColoringGame``
+(``observation_mode="view"`` and ``"ids"``).
+
+In the default "copy" mode every ``get_visible_state`` call builds a fresh node
+list, edge list and colors dict. In "view" mode the engine builds one immutable
+observation per node and hands out the same object on every visit: a
+``MappingProxyType`` over tuples of nodes and edges, plus ``VisibleColors``, a
+live read-only mapping over the engine's own ``node_colors`` restricted to the
+visible ball. Colors therefore always reflect the engine's current state, even in
+an observation an agent kept from an earlier turn; agents that need a snapshot
+must copy it (``dict(state['node_colors'])``).
+
+In "ids" mode (``IdTable``) observations carry integers instead of names: node
+IDs in the order nodes are first revealed, color IDs in level order. Every
+observation holds the same read-only ``IdTableView`` of the table under
+``state['ids']``; the engine extends the table as it reveals nodes; ``nodes`` is an ``array('i')`` and ``edges`` a flat
+``array('i')`` of pairs, each ordered (smaller ID, larger ID) so the pair is the
+edge's canonical key. ``node_colors`` maps node IDs to color IDs (or None).
+Agents answer with IDs too; the referee translates actions back to names.
+``edge_pairs`` iterates the edges of any mode's observation as (u, v) pairs.
+"""
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class VisibleColors(Mapping):
+    """Read-only view of ``node_colors`` limited to ``nodes`` (iterated in that order)."""
+    __slots__ = ("_colors", "_nodes", "_members")
+
+    def __init__(self, node_colors, nodes):
+        self._colors = node_colors
+        self._nodes = nodes
+        self._members = frozenset(nodes)
+
+    def __getitem__(self, node):
+        if node not in self._members:
+            raise KeyError(node)
+        return self._colors[node]
+
+    def __contains__(self, node):
+        return node in self._members
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __repr__(self):
+        return f"VisibleColors({dict(self.items())!r})"
+
+
+def build_view(center, nodes, edges, available_colors, node_colors):
+    """
+    Immutable observation of the ball around ``center``. ``nodes`` and ``edges``
+    are tuples (edges as (u, v) tuples); ``available_colors`` a tuple.
+    """
+    return MappingProxyType({
+        "current_node": center,
+        "available_colors": available_colors,
+        "visible_graph": MappingProxyType({"nodes": nodes, "edges": edges}),
+        "node_colors": VisibleColors(node_colors, nodes),
+    })
+
+
+class IdTable:
+    """
+    Names behind the integer IDs of "ids" observations. ``colors`` lists the
+    level's colors first (``available_colors`` are their IDs), then any other
+    color found on a pre-colored node.
+    """
+    __slots__ = ("colors", "color_ids", "_names", "_ids")
+
+    def __init__(self, colors):
+        self.colors = tuple(colors)
+        self.color_ids = MappingProxyType({c: i for i, c in enumerate(self.colors)})
+        self._names = []  # node ID -> name
+        self._ids = {}    # name -> node ID
+
+    def __len__(self):
+        """Number of nodes revealed so far."""
+        return len(self._names)
+
+    def name(self, node_id):
+        return self._names[node_id]
+
+    def node_id(self, name):
+        """The ID of node ``name``, or None if it has not been revealed."""
+        return self._ids.get(name)
+
+    def color(self, color_id):
+        return self.colors[color_id]
+
+    def color_id(self, color):
+        return self.color_ids.get(color)
+
+    def encode(self, nodes, edges):
+        """
+        ``(node_ids, flat_edges)`` of a ball as ``array('i')``, numbering nodes not
+        seen before (engine side: this is what reveals them).
+        """
+        ids = self._ids
+        names = self._names
+        node_ids = array("i")
+        for name in nodes:
+            i = ids.get(name)
+            if i is None:
+                i = ids[name] = len(names)
+                names.append(name)
+            node_ids.append(i)
+        flat = array("i")
+        for u, v in edges:
+            u, v = ids[u], ids[v]
+            flat.extend((u, v) if u < v else (v, u))
+        return node_ids, flat
+
+
+class IdTableView:
+    """
+    What agents get under ``state['ids']``: lookups into the engine's ``IdTable``
+    (which keeps growing as nodes are revealed) without ``encode``, so an agent
+    cannot number nodes itself.
+    """
+    __slots__ = ("_table",)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        """Number of nodes revealed so far."""
+        return len(self._table)
+
+    @property
+    def colors(self):
+        return self._table.colors
+
+    def name(self, node_id):
+        return self._table.name(node_id)
+
+    def node_id(self, name):
+        """The ID of node ``name``, or None if it has not been revealed."""
+        return self._table.node_id(name)
+
+    def color(self, color_id):
+        return self._table.color(color_id)
+
+    def color_id(self, color):
+        return self._table.color_id(color)
+
+
+def edge_pairs(edges):
+    """The (u, v) pairs of an observation's ``edges``, flat in "ids" mode or not."""
+    if isinstance(edges, array):
+        it = iter(edges)
+        return zip(it, it)
+    return edges
+
+
+def decode_observation(state):
+    """The "copy" mode observation (names, lists and a dict) an "ids" observation encodes."""
+    table = state["ids"]
+    name, colors = table.name, table.colors
+    graph = state["visible_graph"]
+    return {
+        "current_node": name(state["current_node"]),
+        "available_colors": [colors[c] for c in state["available_colors"]],
+        "visible_graph": {
+            "nodes": [name(i) for i in graph["nodes"]],
+            "edges": [[name(u), name(v)] for u, v in edge_pairs(graph["edges"])],
+        },
+        "node_colors": {name(i): None if c is None else colors[c]
+                        for i, c in state["node_colors"].items()},
+    }
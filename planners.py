@@ -0,0 +1,313 @@
+"""
+Planner engines the agents can plug in to color their known graph.
+
+A planner colors ``variables`` given the agent's ``adjacency`` (node -> neighbors),
+the level's ``colors`` and the ``fixed`` colors that must not change:
+
+    plan = planner.plan(adjacency, colors, fixed, variables)
+
+``plan`` maps every variable to a color; ``planner.last_conflicts`` is the number of
+violated edges left in it (0 means the plan is a valid coloring).
+"""
+import heapq
+import random
+import time
+
+
+def _index_problem(adjacency, colors, fixed, variables):
+    """Translate a coloring problem to ints: variable ids, neighbor lists and color counts."""
+    variables = list(variables)
+    idx = {v: i for i, v in enumerate(variables)}
+    cidx = {c: i for i, c in enumerate(colors)}
+    k = len(colors)
+    nbrs = []
+    counts = []  # counts[i][c]: neighbors of variable i (fixed or colored) holding color c
+    for v in variables:
+        row = [0] * k
+        own = []
+        for u in adjacency.get(v, ()):
+            if u == v:
+                continue
+            if u in idx:
+                own.append(idx[u])
+            else:
+                c = fixed.get(u)
+                if c in cidx:
+                    row[cidx[c]] += 1
+        nbrs.append(own)
+        counts.append(row)
+    return variables, idx, cidx, nbrs, counts
+
+
+def exact_coloring(adjacency, colors, fixed, variables, node_budget=None, order="mrv",
+                   seed=None):
+    """
+    Complete backtracking search (forward checking) for a coloring of ``variables``
+    consistent with ``fixed``. ``order`` picks the next variable: "mrv" (fewest
+    colors left, then highest degree) or "degree" (static, highest degree first).
+    With a ``seed``, ties between variables and the order of values are randomized,
+    which gives restarts of the same search a different path.
+
+    Returns ``(status, assignment)`` where status is "sat", "unsat" or "unknown"
+    (``node_budget`` expansions were used up first).
+    """
+    if order not in ("mrv", "degree"):
+        raise ValueError(f"Unknown variable order '{order}'.")
+    variables, idx, cidx, nbrs, counts = _index_problem(adjacency, colors, fixed, variables)
+    n, k = len(variables), len(colors)
+    color = [-1] * n
+    unassigned = set(range(n))
+    stack = []  # frames: [var, candidate colors, next index]
+    expanded = 0
+    rng = random.Random(seed) if seed is not None else None
+    tie = [rng.random() for _ in range(n)] if rng else [0] * n
+
+    def free(i):
+        values = [c for c in range(k) if counts[i][c] == 0]
+        if rng:
+            rng.shuffle(values)
+        return values
+
+    if order == "degree":
+        def pick():
+            return min(unassigned, key=lambda i: (-len(nbrs[i]), tie[i]))
+    else:
+        def pick():
+            return min(unassigned, key=lambda i: (sum(1 for c in counts[i] if c == 0),
+                                                  -len(nbrs[i]), tie[i]))
+
+    def set_color(i, c, delta):
+        for j in nbrs[i]:
+            counts[j][c] += delta
+
+    expand = True
+    while True:
+        if expand:
+            if not unassigned:
+                return "sat", {variables[i]: colors[color[i]] for i in range(n)}
+            if node_budget is not None and expanded >= node_budget:
+                return "unknown", None
+            expanded += 1
+            var = pick()
+            stack.append([var, free(var), 0])
+            expand = False
+        if not stack:
+            return "unsat", None
+        frame = stack[-1]
+        var, values, pos = frame
+        if color[var] >= 0:
+            set_color(var, color[var], -1)
+            color[var] = -1
+            unassigned.add(var)
+        chosen = -1
+        while pos < len(values):
+            c = values[pos]
+            pos += 1
+            # Forward checking: no unassigned neighbor may lose its last color
+            if all(any(counts[j][d] == 0 for d in range(k) if d != c)
+                   for j in nbrs[var] if color[j] < 0):
+                chosen = c
+                break
+        frame[2] = pos
+        if chosen < 0:
+            stack.pop()
+            continue
+        color[var] = chosen
+        set_color(var, chosen, 1)
+        unassigned.discard(var)
+        expand = True
+
+
+class LocalSearchPlanner:
+    """
+    DSATUR greedy warm start followed by min-conflicts or tabu (TabuCol) repair.
+
+    Conflicts are tracked incrementally: every variable keeps a per-color count of
+    its colored neighbors, so a recoloring costs O(degree). Fixed nodes are never
+    recolored. If conflicts remain and the conflicted variables plus their
+    neighbors number at most ``exact_core_size``, that residual core is handed to
+    ``exact_coloring`` with everything else held fixed.
+    """
+    def __init__(self, method="min_conflicts", max_steps=None, time_limit=None,
+                 noise=0.02, tabu_sample=64, seed=0, exact_core_size=0, exact_node_budget=20000):
+        if method not in ("min_conflicts", "tabu"):
+            raise ValueError(f"Unknown local search method '{method}'.")
+        self.method = method
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.noise = noise
+        self.tabu_sample = tabu_sample
+        self.exact_core_size = exact_core_size
+        self.exact_node_budget = exact_node_budget
+        self.rng = random.Random(seed)
+        self.last_conflicts = 0
+        self.last_steps = 0
+
+    def plan(self, adjacency, colors, fixed, variables, warm_start=None):
+        """Color ``variables``; colors in ``warm_start`` are reused before DSATUR fills the rest."""
+        variables, idx, cidx, nbrs, counts = _index_problem(adjacency, colors, fixed, variables)
+        n, k = len(variables), len(colors)
+        if n == 0 or k == 0:
+            self.last_conflicts = 0
+            return {}
+
+        color = self._dsatur(variables, cidx, nbrs, counts, warm_start or {})
+        total, conflicted = self._repair(nbrs, counts, color, k)
+
+        if total and self.exact_core_size:
+            core = set(conflicted)
+            for i in conflicted:
+                core.update(nbrs[i])
+            if len(core) <= self.exact_core_size:
+                held = dict(fixed)
+                held.update((variables[i], colors[color[i]]) for i in range(n) if i not in core)
+                status, solved = exact_coloring(adjacency, colors, held,
+                                                [variables[i] for i in core], self.exact_node_budget)
+                if status == "sat":
+                    for v, c in solved.items():
+                        color[idx[v]] = cidx[c]
+                    total = 0
+
+        self.last_conflicts = total
+        return {variables[i]: colors[color[i]] for i in range(n)}
+
+    def _dsatur(self, variables, cidx, nbrs, counts, warm_start):
+        """Greedy DSATUR coloring; updates ``counts`` as colors are placed."""
+        n, k = len(variables), len(counts[0]) if counts else 0
+        color = [-1] * n
+
+        def place(i, c):
+            color[i] = c
+            for j in nbrs[i]:
+                counts[j][c] += 1
+
+        for i, v in enumerate(variables):
+            c = cidx.get(warm_start.get(v))
+            if c is not None:
+                place(i, c)
+
+        saturation = [sum(1 for c in row if c) for row in counts]
+        heap = [(-saturation[i], -len(nbrs[i]), i) for i in range(n) if color[i] < 0]
+        heapq.heapify(heap)
+        while heap:
+            neg_sat, _, i = heapq.heappop(heap)
+            if color[i] >= 0 or -neg_sat != saturation[i]:
+                continue  # already colored or stale entry
+            row = counts[i]
+            c = min(range(k), key=row.__getitem__)  # first free color, else least conflicting
+            color[i] = c
+            for j in nbrs[i]:
+                if counts[j][c] == 0 and color[j] < 0:
+                    saturation[j] += 1
+                    heapq.heappush(heap, (-saturation[j], -len(nbrs[j]), j))
+                counts[j][c] += 1
+        return color
+
+    def _repair(self, nbrs, counts, color, k):
+        """Min-conflicts / tabu repair. Returns (violated edges, conflicted variables)."""
+        n = len(color)
+        conflicted = []
+        pos = [-1] * n
+
+        def mark(i):
+            if counts[i][color[i]]:
+                if pos[i] < 0:
+                    pos[i] = len(conflicted)
+                    conflicted.append(i)
+            elif pos[i] >= 0:
+                last = conflicted.pop()
+                if last != i:
+                    conflicted[pos[i]] = last
+                    pos[last] = pos[i]
+                pos[i] = -1
+
+        total = 0
+        for i in range(n):
+            mark(i)
+            total += counts[i][color[i]]
+        # Variable-variable conflicts were counted from both ends
+        total -= sum(1 for i in range(n) for j in nbrs[i] if j > i and color[i] == color[j])
+        if k <= 1:
+            return total, list(conflicted)  # no other color to move to
+
+        def recolor(i, new):
+            old = color[i]
+            color[i] = new
+            for j in nbrs[i]:
+                row = counts[j]
+                row[old] -= 1
+                row[new] += 1
+                if color[j] == old or color[j] == new:
+                    mark(j)
+            mark(i)
+
+        max_steps = self.max_steps if self.max_steps is not None else 50 * n + 1000
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        rng = self.rng
+        best_total, best = total, color[:]
+        tabu = [[0] * k for _ in range(n)] if self.method == "tabu" else None
+        step = 0
+        while total and step < max_steps:
+            if deadline is not None and step % 256 == 0 and time.perf_counter() >= deadline:
+                break
+            step += 1
+            if tabu is None:
+                i = conflicted[rng.randrange(len(conflicted))]
+                row = counts[i]
+                if rng.random() < self.noise:
+                    new = rng.randrange(k)
+                else:
+                    low = min(row[c] for c in range(k) if c != color[i])
+                    new = rng.choice([c for c in range(k) if c != color[i] and row[c] == low])
+                if new == color[i]:
+                    continue
+            else:
+                i, new, delta = -1, -1, None
+                # Large conflict sets are sampled to keep a tabu step bounded
+                candidates = conflicted
+                if len(conflicted) > self.tabu_sample:
+                    candidates = rng.sample(conflicted, self.tabu_sample)
+                for j in candidates:
+                    row = counts[j]
+                    here = row[color[j]]
+                    for c in range(k):
+                        if c == color[j]:
+                            continue
+                        d = row[c] - here
+                        # Aspiration: a tabu move is allowed if it beats the best seen
+                        if tabu[j][c] > step and total + d >= best_total:
+                            continue
+                        if delta is None or d < delta or (d == delta and rng.random() < 0.5):
+                            i, new, delta = j, c, d
+                if i < 0:
+                    continue
+                tabu[i][color[i]] = step + int(0.6 * len(conflicted)) + rng.randrange(10)
+            total += counts[i][new] - counts[i][color[i]]
+            recolor(i, new)
+            if total < best_total:
+                best_total = total
+                best = color[:]
+
+        self.last_steps = step
+        if best_total < total:
+            # Restore the best coloring seen (counts must follow the colors)
+            for i in range(n):
+                if color[i] != best[i]:
+                    recolor(i, best[i])
+            total = best_total
+        return total, list(conflicted)
+
+
+def make_planner(spec):
+    """
+    Resolve an agent's ``planner`` option: None, a planner object, a method name,
+    or "portfolio" (see ``portfolio.PortfolioPlanner``).
+    """
+    if spec is None or hasattr(spec, "plan"):
+        return spec
+    if spec in ("min_conflicts", "tabu"):
+        return LocalSearchPlanner(method=spec)
+    if spec == "portfolio":
+        from portfolio import PortfolioPlanner  # imports planners; kept out of module load
+        return PortfolioPlanner()
+    raise ValueError(f"Unknown planner '{spec}'.")
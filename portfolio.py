@@ -0,0 +1,170 @@
+"""
+Planner portfolio: race several planner configurations in parallel processes.
+
+No configuration wins everywhere: MRV backtracking is instant on some known
+graphs and hopeless on others where local search finishes at once. The
+portfolio starts one process per configuration (exact search with different
+variable orders and randomized restarts, min-conflicts and tabu with different
+seeds), takes the first valid plan and terminates the rest. A conclusive "unsat"
+from an exact configuration also ends the race; the best plan seen is returned.
+A race lasts at most ``time_limit`` seconds (``DEFAULT_TIME_LIMIT`` unless set;
+None waits for a conclusive answer). Exact configurations have a node budget, and
+local searches stop a little before the deadline so their best plans arrive in
+time to be used.
+
+Every race updates per-configuration statistics (races, wins, seconds spent
+winning), optionally persisted as JSON in ``stats_file``. When there are more
+configurations than ``workers``, the ones with the best win rate run first.
+
+It has the planners' interface, so an agent can use it directly:
+
+    B22CH032(initial_state, planner="portfolio")
+    B22CH032(initial_state, planner=PortfolioPlanner(workers=4, stats_file="wins.json"))
+"""
+import json
+import multiprocessing
+import os
+import time
+
+from planners import LocalSearchPlanner, exact_coloring
+
+DEFAULT_TIME_LIMIT = 5.0
+EXACT_NODE_BUDGET = 200000
+LOCAL_SHARE = 0.8  # fraction of the race's time limit given to local searches
+
+DEFAULT_CONFIGS = (
+    {"name": "exact_mrv", "kind": "exact", "order": "mrv", "node_budget": EXACT_NODE_BUDGET},
+    {"name": "exact_degree", "kind": "exact", "order": "degree",
+     "node_budget": EXACT_NODE_BUDGET},
+    {"name": "exact_mrv_s1", "kind": "exact", "order": "mrv", "seed": 1,
+     "node_budget": EXACT_NODE_BUDGET},
+    {"name": "exact_mrv_s2", "kind": "exact", "order": "mrv", "seed": 2,
+     "node_budget": EXACT_NODE_BUDGET},
+    {"name": "tabu_s0", "kind": "local", "method": "tabu", "seed": 0},
+    {"name": "tabu_s1", "kind": "local", "method": "tabu", "seed": 1},
+    {"name": "min_conflicts_s0", "kind": "local", "method": "min_conflicts", "seed": 0},
+)
+
+
+def run_config(config, adjacency, colors, fixed, variables, warm_start=None):
+    """Run one configuration: (status, plan, conflicts); status is "sat", "unsat" or "unknown"."""
+    if config["kind"] == "exact":
+        status, plan = exact_coloring(adjacency, colors, fixed, variables,
+                                      config.get("node_budget"), config.get("order", "mrv"),
+                                      config.get("seed"))
+        return status, plan, 0 if status == "sat" else None
+    planner = LocalSearchPlanner(method=config.get("method", "tabu"),
+                                 max_steps=config.get("max_steps"),
+                                 time_limit=config.get("time_limit"),
+                                 seed=config.get("seed", 0))
+    plan = planner.plan(adjacency, colors, fixed, variables, warm_start)
+    return ("sat" if planner.last_conflicts == 0 else "unknown"), plan, planner.last_conflicts
+
+
+def _worker(queue, config, problem):
+    start = time.perf_counter()
+    try:
+        status, plan, conflicts = run_config(config, *problem)
+    except Exception as e:  # report instead of dying silently
+        status, plan, conflicts = f"error: {e}", None, None
+    queue.put((config["name"], status, plan, conflicts, time.perf_counter() - start))
+
+
+class PortfolioPlanner:
+    """Races planner configurations in processes; the first valid plan wins."""
+    def __init__(self, configs=DEFAULT_CONFIGS, workers=None, time_limit=DEFAULT_TIME_LIMIT,
+                 stats_file=None, inline_size=48):
+        self.configs = [dict(c) for c in configs]
+        # Racing pays off even when processes share cores: the first finisher wins
+        self.workers = workers or min(len(self.configs), max(4, os.cpu_count() or 1))
+        self.time_limit = time_limit
+        self.stats_file = stats_file
+        self.inline_size = inline_size  # smaller problems are solved in-process
+        self.stats = self._load_stats()
+        self.last_conflicts = 0
+        self.last_winner = None
+
+    def _load_stats(self):
+        if self.stats_file and os.path.exists(self.stats_file):
+            with open(self.stats_file) as f:
+                return json.load(f)
+        return {}
+
+    def _save_stats(self):
+        if self.stats_file:
+            tmp = f"{self.stats_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.stats, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.stats_file)
+
+    def _record(self, raced, winner, seconds):
+        for name in raced:
+            entry = self.stats.setdefault(name, {"races": 0, "wins": 0, "win_seconds": 0.0})
+            entry["races"] += 1
+            if name == winner:
+                entry["wins"] += 1
+                entry["win_seconds"] += seconds
+        self._save_stats()
+
+    def schedule(self):
+        """Configurations to race, best win rate first (untried ones count as promising)."""
+        def rate(config):
+            entry = self.stats.get(config["name"], {"races": 0, "wins": 0})
+            return -(entry["wins"] + 1) / (entry["races"] + 2)
+        return sorted(self.configs, key=rate)[:self.workers]
+
+    def plan(self, adjacency, colors, fixed, variables, warm_start=None):
+        variables = list(variables)
+        problem = (adjacency, colors, fixed, variables, warm_start)
+        if len(variables) <= self.inline_size:
+            status, plan, _ = run_config({"kind": "exact", "node_budget": 20000}, *problem)
+            if status == "sat":
+                self.last_conflicts, self.last_winner = 0, "inline"
+                return plan
+        return self._race(problem)
+
+    def _race(self, problem):
+        configs = self.schedule()
+        if self.time_limit is not None:
+            configs = [dict(c, time_limit=self.time_limit * LOCAL_SHARE)
+                       if c["kind"] == "local" and c.get("time_limit") is None else c
+                       for c in configs]
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        context = multiprocessing.get_context(method)
+        queue = context.Queue()
+        processes = [context.Process(target=_worker, args=(queue, config, problem), daemon=True)
+                     for config in configs]
+        for p in processes:
+            p.start()
+
+        deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        best, best_conflicts, winner, seconds = None, None, None, 0.0
+        try:
+            for _ in processes:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    name, status, plan, conflicts, elapsed = queue.get(timeout=timeout)
+                except Exception:  # queue.Empty: out of time
+                    break
+                if plan is not None and (best is None or conflicts < best_conflicts):
+                    best, best_conflicts = plan, conflicts
+                if status in ("sat", "unsat"):
+                    winner, seconds = name, elapsed
+                    break
+        finally:
+            for p in processes:
+                if p.is_alive():
+                    p.terminate()
+            for p in processes:
+                p.join()
+            queue.close()
+
+        self._record([c["name"] for c in configs], winner, seconds)
+        self.last_winner = winner
+        if best is None:
+            # Nobody produced a plan in time: fall back to a quick local greedy repair
+            planner = LocalSearchPlanner(max_steps=1000)
+            best = planner.plan(*problem)
+            best_conflicts = planner.last_conflicts
+        self.last_conflicts = best_conflicts
+        return best
@@ -0,0 +1,303 @@
+"""
+Offline full-information reference solver: the best score a level allows.
+
+With the whole graph known, an optimal game colors every node correctly with no
+reassignment, so the best score is ``110 - min_moves`` when the level is
+colorable (and -inf otherwise). Moves are the only thing left to optimize:
+
+- The agent may move to any node within ``visibility_radius`` hops, so going from
+  u to v costs ``ceil(dist(u, v) / radius)`` moves.
+- It has to stand on every node that is not pre-colored, starting from
+  ``start_node``; the start node itself is colored without moving.
+
+The minimum is the shortest open path from the start through those targets in
+that metric. It is solved exactly (Held-Karp) for up to ``exact_targets`` targets;
+up to ``dense_targets`` targets get nearest neighbour + 2-opt over a matrix of
+move costs as an upper bound and the minimum spanning tree weight as a lower
+bound. Beyond that the matrix (one BFS per target, quadratic memory) is skipped:
+the nearest neighbour path is built from BFS runs that stop at the nearest
+remaining target, and the lower bound is one move per target. Colorability is
+checked with the planners' exact search after a quick local-search attempt.
+
+Results are cached on disk, keyed by the SHA-256 of the level file, so a
+tournament can report optimality gaps without solving again:
+
+    python reference_solver.py level*.json
+    python reference_solver.py level*.json --results results.json   # game_runner --output
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+from collections import defaultdict, deque
+
+from planners import LocalSearchPlanner, exact_coloring
+
+SOLVER_VERSION = 2
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".reference_cache")
+INF = float("inf")
+
+
+def level_digest(level_file):
+    with open(level_file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def check_colorable(adjacency, colors, pre_colored, node_budget=200000):
+    """("sat" | "unsat" | "unknown", coloring or None) for the whole level."""
+    for u, c in pre_colored.items():
+        if c not in colors or any(pre_colored.get(v) == c for v in adjacency[u]):
+            return "unsat", None
+    variables = [n for n in adjacency if n not in pre_colored]
+    planner = LocalSearchPlanner(method="tabu", max_steps=20 * len(variables) + 1000)
+    plan = planner.plan(adjacency, colors, pre_colored, variables)
+    if planner.last_conflicts == 0:
+        return "sat", plan
+    return exact_coloring(adjacency, colors, pre_colored, variables, node_budget)
+
+
+def _bfs(adjacency, source):
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for nb in adjacency[node]:
+            if nb not in dist:
+                dist[nb] = dist[node] + 1
+                queue.append(nb)
+    return dist
+
+
+def move_matrix(adjacency, points, radius):
+    """Move costs ceil(hops / radius) between ``points`` (INF if disconnected)."""
+    matrix = []
+    for p in points:
+        dist = _bfs(adjacency, p)
+        matrix.append([math.ceil(dist[q] / radius) if q in dist else INF for q in points])
+    return matrix
+
+
+def held_karp(matrix):
+    """Exact shortest open path from point 0 through all others: (cost, order)."""
+    n = len(matrix)
+    if n == 1:
+        return 0, []
+    full = (1 << (n - 1)) - 1
+    # best[mask][j]: cheapest path from 0 over the targets in mask, ending at target j
+    best = [dict() for _ in range(full + 1)]
+    for j in range(1, n):
+        best[1 << (j - 1)][j] = (matrix[0][j], 0)
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j, (cost, _) in row.items():
+            for t in range(1, n):
+                bit = 1 << (t - 1)
+                if mask & bit:
+                    continue
+                new = cost + matrix[j][t]
+                old = best[mask | bit].get(t)
+                if old is None or new < old[0]:
+                    best[mask | bit][t] = (new, j)
+    end = min(best[full], key=lambda j: best[full][j][0])
+    cost = best[full][end][0]
+    order, mask = [], full
+    while end != 0:
+        order.append(end)
+        end, mask = best[mask][end][1], mask & ~(1 << (end - 1))
+    return cost, order[::-1]
+
+
+def path_cost(matrix, order):
+    path = [0] + order
+    return sum(matrix[a][b] for a, b in zip(path, path[1:]))
+
+
+def approximate_path(matrix, two_opt_passes=3):
+    """Nearest neighbour + open-path 2-opt from point 0: (cost, order)."""
+    n = len(matrix)
+    left, here, order = set(range(1, n)), 0, []
+    while left:
+        row = matrix[here]
+        here = min(left, key=lambda t: (row[t], t))
+        left.remove(here)
+        order.append(here)
+    path = [0] + order
+    for _ in range(two_opt_passes):
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                before = matrix[path[i - 1]][path[i]]
+                after = matrix[path[i - 1]][path[j]]
+                if j + 1 < n:
+                    before += matrix[path[j]][path[j + 1]]
+                    after += matrix[path[i]][path[j + 1]]
+                if after < before:
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    improved = True
+        if not improved:
+            break
+    return path_cost(matrix, path[1:]), path[1:]
+
+
+def nearest_neighbour_walk(adjacency, start, targets, radius):
+    """
+    Nearest neighbour open path from ``start`` through ``targets`` without a
+    distance matrix: (cost, order). Each leg is a BFS from the current node that
+    stops at the depth of the nearest remaining target (ties go to the smallest name).
+    """
+    left = set(targets)
+    here, cost, order = start, 0, []
+    while left:
+        seen = {here}
+        level, depth, hits = [here], 0, []
+        while level and not hits:
+            depth += 1
+            following = []
+            for node in level:
+                for nb in adjacency[node]:
+                    if nb not in seen:
+                        seen.add(nb)
+                        following.append(nb)
+            hits = [n for n in following if n in left]
+            level = following
+        if not hits:
+            return INF, order  # the remaining targets are unreachable
+        here = min(hits)
+        left.remove(here)
+        order.append(here)
+        cost += math.ceil(depth / radius)
+    return cost, order
+
+
+def spanning_tree_bound(matrix):
+    """Minimum spanning tree weight (Prim); no open path through all points is shorter."""
+    n = len(matrix)
+    key = [INF] * n
+    key[0] = 0
+    done = [False] * n
+    total = 0
+    for _ in range(n):
+        u = min((i for i in range(n) if not done[i]), key=lambda i: key[i])
+        done[u] = True
+        total += key[u]
+        for v in range(n):
+            if not done[v] and matrix[u][v] < key[v]:
+                key[v] = matrix[u][v]
+    return total
+
+
+def solve_level(level_file, exact_targets=12, dense_targets=1500, node_budget=200000):
+    """Reference result for ``level_file`` (uncached); see the module docstring."""
+    with open(level_file) as f:
+        data = json.load(f)
+    adjacency = defaultdict(set)
+    for n in data["graph"]["nodes"]:
+        adjacency[n]
+    for u, v in data["graph"]["edges"]:
+        adjacency[u].add(v)
+        adjacency[v].add(u)
+    pre_colored = data.get("pre_colored", {})
+    start = data["start_node"]
+    radius = max(1, data["visibility_radius"])
+
+    status, coloring = check_colorable(adjacency, data["colors"], pre_colored, node_budget)
+
+    targets = sorted(n for n in adjacency if n not in pre_colored and n != start)
+    points = [start] + targets
+    if len(targets) > dense_targets:
+        upper, visit_order = nearest_neighbour_walk(adjacency, start, targets, radius)
+        # Every target needs a move of its own to stand on it
+        lower = len(targets) if upper != INF else INF
+        method = "bfs-nn/count"
+    else:
+        matrix = move_matrix(adjacency, points, radius)
+        if len(targets) <= exact_targets:
+            cost, order = held_karp(matrix)
+            lower, upper, method = cost, cost, "held-karp"
+        else:
+            upper, order = approximate_path(matrix)
+            lower, method = spanning_tree_bound(matrix), "nn+2opt/mst"
+        visit_order = [points[i] for i in order]
+
+    def score(moves):
+        return None if status != "sat" or moves == INF else 110 - moves
+
+    return {
+        "level": level_file,
+        "sha256": level_digest(level_file),
+        "solver_version": SOLVER_VERSION,
+        "colorable": status,
+        "coloring": coloring if status == "sat" else None,
+        "method": method,
+        "exact": lower == upper,
+        "moves_lower": None if lower == INF else lower,
+        "moves_upper": None if upper == INF else upper,
+        "visit_order": visit_order,
+        "best_score": score(upper),       # achievable with full information
+        "score_bound": score(lower),      # no agent can score more
+    }
+
+
+def reference(level_file, cache_dir=CACHE_DIR, refresh=False, **options):
+    """Cached ``solve_level``: reuse the stored result for identical level content."""
+    digest = level_digest(level_file)
+    path = os.path.join(cache_dir, f"{digest}.json")
+    if not refresh and os.path.exists(path):
+        with open(path) as f:
+            result = json.load(f)
+        if result.get("solver_version") == SOLVER_VERSION:
+            result["level"] = level_file
+            return result
+    result = solve_level(level_file, **options)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, path)
+    return result
+
+
+def optimality_gap(result, score):
+    """(low, high) range of the optimal score minus ``score`` given the reference bounds."""
+    if result["score_bound"] is None:
+        return None
+    if score is None or score == -INF:
+        return INF, INF
+    return max(0, result["best_score"] - score), result["score_bound"] - score
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reference scores and optimality gaps.")
+    parser.add_argument("levels", nargs="+")
+    parser.add_argument("--results", help="JSON results from game_runner --output")
+    parser.add_argument("--exact-targets", type=int, default=12)
+    parser.add_argument("--dense-targets", type=int, default=1500,
+                        help="above this many targets, skip the distance matrix")
+    parser.add_argument("--refresh", action="store_true", help="ignore the disk cache")
+    args = parser.parse_args()
+
+    refs = {}
+    print(f"{'level':<24} {'colorable':>9} {'moves':>11} {'best score':>11} {'method':>12}")
+    for level in args.levels:
+        r = reference(level, refresh=args.refresh, exact_targets=args.exact_targets,
+                      dense_targets=args.dense_targets)
+        refs[os.path.abspath(level)] = r
+        moves = (str(r["moves_lower"]) if r["exact"]
+                 else f"{r['moves_lower']}..{r['moves_upper']}")
+        best = r["score_bound"] if r["exact"] else f"<={r['score_bound']}"
+        print(f"{level:<24} {r['colorable']:>9} {moves:>11} {str(best):>11} {r['method']:>12}")
+
+    if args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+        print(f"\n{'level':<24} {'agent':<16} {'seed':>6} {'score':>7} {'gap':>9}")
+        for run in results:
+            r = refs.get(os.path.abspath(run["level"]))
+            if r is None:
+                continue
+            gap = optimality_gap(r, run["score"])
+            text = "n/a" if gap is None else (str(gap[1]) if gap[0] == gap[1]
+                                               else f"{gap[0]}..{gap[1]}")
+            print(f"{run['level']:<24} {run['agent']:<16} {str(run['seed']):>6} "
+                  f"{run['score']:>7} {text:>9}")
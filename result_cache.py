@@ -0,0 +1,230 @@
+"""
+Content-hash cache of game summaries, so reruns of identical games are instant.
+
+A game is identified by the SHA-256 of:
+
+- the source of the agent's module and of every local module it imports
+  (planners, routing, ...), found by following its import statements;
+- the source of the engine and runner modules and of the local modules they
+  import (the "engine version"; feasibility's exact check runs ``planners``);
+- the level file contents, the ``random.seed`` value, the engine options, the
+  early-termination setting and any ``functools.partial`` arguments bound to
+  the agent class;
+- ``PYTHONHASHSEED``: agents iterate over sets of node names, whose order
+  changes between interpreter runs unless hash randomization is pinned.
+
+Games that are not reproducible bypass the cache: hash randomization is on,
+or the agent's sources use randomness no seed controls (``SystemRandom``,
+``secrets``, ``os.urandom``, ``uuid4``, ``Random()`` / ``seed()`` without an
+argument), or they use the module-level ``random`` functions and the game has no
+seed. Agents with wall-clock budgets (e.g. ``time_budget``) are only as
+deterministic as the machine; leave them unbudgeted when caching.
+
+Summaries are stored one JSON file per key; once the directory holds more than
+``max_bytes`` the least recently used entries are evicted.
+
+    python game_runner.py --levels 'level*.json' --agents '*' --seeds 0 --cache .result_cache
+"""
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+CACHE_VERSION = 1
+ENGINE_MODULES = ("game_engine", "game_runner", "ball_cache", "observation", "feasibility",
+                  "planners", "kernel", "transposition")
+
+_UNSEEDED_CALLS = {("random", "SystemRandom"), ("os", "urandom"), ("uuid", "uuid4")}
+
+
+def _module_file(name, directory):
+    path = os.path.join(directory, name.split(".")[0] + ".py")
+    return path if os.path.isfile(path) else None
+
+
+def local_sources(path):
+    """``path`` and the local modules it imports, transitively: {path: source}."""
+    directory = os.path.dirname(os.path.abspath(path))
+    sources, pending = {}, [os.path.abspath(path)]
+    while pending:
+        current = pending.pop()
+        if current in sources:
+            continue
+        with open(current, encoding="utf-8") as f:
+            sources[current] = f.read()
+        for node in ast.walk(ast.parse(sources[current])):
+            if isinstance(node, ast.Import):
+                names = [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                found = _module_file(name, directory)
+                if found:
+                    pending.append(found)
+    return sources
+
+
+_SOURCE_MEMO = {}  # entry paths -> (stamps of every file read, (digest, reasons, global_random))
+
+
+def _stamps(paths):
+    return {p: (os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths}
+
+
+def hashed_sources(paths):
+    """
+    (digest, reasons, global_random) of ``paths`` and the local modules they import
+    (see ``randomness_report``). Memoised per process until one of the files changes,
+    so keying each game of a tournament does not re-read and re-parse the sources.
+    """
+    key = tuple(sorted(paths))
+    memo = _SOURCE_MEMO.get(key)
+    if memo is not None:
+        try:
+            if _stamps(memo[0]) == memo[0]:
+                return memo[1]
+        except OSError:
+            pass
+    sources = {}
+    for path in key:
+        sources.update(local_sources(path))
+    digest = hashlib.sha256()
+    for p in sorted(sources):
+        digest.update(os.path.basename(p).encode() + b"\0" + sources[p].encode())
+    result = (digest.hexdigest(),) + randomness_report(sources)
+    _SOURCE_MEMO[key] = (_stamps(sources), result)
+    return result
+
+
+def randomness_report(sources):
+    """
+    (reasons the code is nondeterministic whatever the seed, whether it uses the
+    module-level ``random`` functions) for a {path: source} mapping.
+    """
+    reasons, global_random = [], False
+    for path, source in sources.items():
+        name = os.path.basename(path)
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                modules = ([a.name for a in node.names] if isinstance(node, ast.Import)
+                           else [node.module or ""])
+                if "secrets" in modules:
+                    reasons.append(f"{name}:{node.lineno} imports secrets")
+                if isinstance(node, ast.ImportFrom) and node.module == "random":
+                    global_random = True  # from random import choice, ...
+                    if any(a.name == "SystemRandom" for a in node.names):
+                        reasons.append(f"{name}:{node.lineno} imports random.SystemRandom")
+                continue
+            if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+                continue
+            owner = node.func.value.id if isinstance(node.func.value, ast.Name) else None
+            attr = node.func.attr
+            if (owner, attr) in _UNSEEDED_CALLS:
+                reasons.append(f"{name}:{node.lineno} calls {owner}.{attr}")
+            elif owner == "random" and attr in ("Random", "seed") and not node.args \
+                    and not node.keywords:
+                reasons.append(f"{name}:{node.lineno} calls random.{attr}() without a seed")
+            elif owner == "random":
+                global_random = True
+    return reasons, global_random
+
+
+class ResultCache:
+    """Directory of cached game summaries keyed by content hash, LRU-evicted by size."""
+    def __init__(self, directory=".result_cache", max_bytes=64 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _engine(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        return hashed_sources([os.path.join(here, name + ".py") for name in ENGINE_MODULES])[0]
+
+    def _agent(self, agent_class):
+        target = agent_class.func if isinstance(agent_class, functools.partial) else agent_class
+        return hashed_sources([inspect.getsourcefile(target)])
+
+    def key(self, agent_class, level_file, seed=None, engine_options=None,
+            early_termination=False):
+        """
+        Cache key for a game, or (None, reason) when the game cannot be reproduced
+        (counted in ``bypassed``). Returns (key, None) otherwise.
+        """
+        key, reason = self._key(agent_class, level_file, seed, engine_options,
+                                early_termination)
+        if key is None:
+            self.bypassed += 1
+        return key, reason
+
+    def _key(self, agent_class, level_file, seed, engine_options, early_termination):
+        hash_seed = os.environ.get("PYTHONHASHSEED", "random")
+        if hash_seed in ("", "random"):
+            return None, "PYTHONHASHSEED is not fixed"
+        agent_digest, reasons, global_random = self._agent(agent_class)
+        if reasons:
+            return None, "; ".join(reasons)
+        if global_random and seed is None:
+            return None, "agent uses the random module and no seed was given"
+        if isinstance(agent_class, functools.partial):
+            bound = repr((agent_class.func.__qualname__, agent_class.args,
+                          sorted(agent_class.keywords.items())))
+        else:
+            bound = agent_class.__qualname__
+        with open(level_file, "rb") as f:
+            level_digest = hashlib.sha256(f.read()).hexdigest()
+        parts = [str(CACHE_VERSION), self._engine(), agent_digest, bound, level_digest,
+                 repr(seed), repr(sorted((engine_options or {}).items())), hash_seed]
+        if early_termination:  # only changes games that fail; older keys stay valid
+            parts.append("early_termination")
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest(), None
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)  # mark as recently used
+        self.hits += 1
+        return summary
+
+    def put(self, key, summary):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(summary, f)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bypassed": self.bypassed}
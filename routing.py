@@ -0,0 +1,103 @@
+"""
+Move-minimizing route planning over the agent's known graph.
+
+Every move costs a point, so instead of stepping toward one target at a time the
+agents keep a short open tour from their position through the nodes they still
+have to visit (known uncolored nodes plus frontier nodes whose neighborhoods are
+unexplored). The tour is built with nearest neighbour, improved with 2-opt and
+kept across turns: targets that disappear are dropped, newly revealed ones are
+spliced in by cheapest insertion. Hop distances come from the agent's
+``NavigationIndex``, whose BFS trees survive edge discoveries.
+"""
+INF = float("inf")
+
+
+class TourPlanner:
+    """Open tour over target nodes using BFS hop distances in the known graph."""
+    def __init__(self, navigation, max_targets=32, two_opt_passes=2):
+        self.navigation = navigation
+        self.max_targets = max_targets
+        self.two_opt_passes = two_opt_passes
+        self.tour = []
+        self._planned = None  # (start, targets, navigation version) of the current tour
+
+    def distances(self, source):
+        """Hop distances from ``source`` to every reachable known node."""
+        return self.navigation.tree(source).dist
+
+    def plan(self, start, targets, preferred=frozenset()):
+        """
+        Return the tour (list of targets, first one next) from ``start``. Among
+        equally distant targets those in ``preferred`` come first.
+        """
+        key = (start, frozenset(targets), frozenset(preferred), self.navigation.version)
+        if key == self._planned:
+            return self.tour
+        from_start = self.distances(start)
+        reachable = sorted((t for t in targets if t != start and t in from_start),
+                           key=lambda t: (from_start[t], t not in preferred, t))[:self.max_targets]
+        wanted = set(reachable)
+
+        tour = [t for t in self.tour if t in wanted]
+        if not tour:
+            tour = self._nearest_neighbour(start, reachable, preferred)
+        else:
+            placed = set(tour)
+            for t in reachable:
+                if t not in placed:
+                    self._insert_cheapest(start, tour, t)
+        self.tour = self._two_opt(start, tour)
+        self._planned = key
+        return self.tour
+
+    def next_hop(self, start, target):
+        """Neighbor of ``start`` on a shortest known path to ``target`` (None if unreachable)."""
+        return self.navigation.next_hop(start, target)
+
+    def _d(self, a, b):
+        return self.distances(a).get(b, INF)
+
+    def _nearest_neighbour(self, start, targets, preferred=frozenset()):
+        tour = []
+        left = set(targets)
+        here = start
+        while left:
+            dist = self.distances(here)
+            here = min(left, key=lambda t: (dist.get(t, INF), t not in preferred, t))
+            left.remove(here)
+            tour.append(here)
+        return tour
+
+    def _insert_cheapest(self, start, tour, node):
+        path = [start] + tour
+        best_pos, best_cost = len(tour), self._d(path[-1], node)
+        for i in range(len(path) - 1):
+            cost = (self._d(path[i], node) + self._d(node, path[i + 1])
+                    - self._d(path[i], path[i + 1]))
+            if cost < best_cost:
+                best_pos, best_cost = i, cost
+        tour.insert(best_pos, node)
+
+    def _two_opt(self, start, tour):
+        """2-opt on the open path start -> tour (the end of the path is free)."""
+        path = [start] + tour
+        m = len(path)
+        rows = {p: self.distances(p) for p in path}  # one tree lookup per node, not per pair
+
+        def d(a, b):
+            return rows[a].get(b, INF)
+        for _ in range(self.two_opt_passes):
+            improved = False
+            for i in range(1, m - 1):
+                for j in range(i + 1, m):
+                    before = d(path[i - 1], path[i])
+                    after = d(path[i - 1], path[j])
+                    if j + 1 < m:
+                        before += d(path[j], path[j + 1])
+                        after += d(path[i], path[j + 1])
+                    if after < before:
+                        path[i:j + 1] = reversed(path[i:j + 1])
+                        improved = True
+            if not improved:
+                break
+        return path[1:]
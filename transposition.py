@@ -0,0 +1,62 @@
+"""
+Transposition table for the agents' exact search.
+
+Solved subproblems are memoized under a canonical key of (residual subgraph,
+boundary colors): the set of unassigned nodes, the known edges between them and
+the colors of their already-colored neighbors. A component of the unassigned
+graph with the same key always has the same answer, so repeated or overlapping
+planning turns can reuse it without searching again.
+"""
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """Size-bounded LRU map from subproblem keys to (satisfiable, solution)."""
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(nodes, adjacency, boundary):
+        """
+        Canonical key of the subproblem on ``nodes`` (a set) given the ``boundary``
+        colors {neighbor: color} of its colored neighbors.
+        """
+        edges = frozenset((u, v) for u in nodes for v in adjacency[u] if v in nodes and u < v)
+        return frozenset(nodes), edges, frozenset(boundary.items())
+
+    def get(self, key):
+        """Return (satisfiable, solution) for ``key``, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, solution):
+        """Record a solution dict, or None for a subproblem proven unsatisfiable."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (solution is not None, solution)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
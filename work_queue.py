@@ -0,0 +1,274 @@
+"""
+Directory-based work queue for running a tournament on many workers.
+
+A coordinator submits one task per (level, agent, seed) game into a queue
+directory that every worker can reach (a shared filesystem, or one local disk
+for workers on the same box):
+
+    QUEUE/pending/<task>.json   waiting to be played
+    QUEUE/leased/<task>.json    being played; its mtime is the lease heartbeat
+    QUEUE/done/<task>.json      the game summary (or the error that ended it)
+
+A worker claims a task by renaming it from ``pending/`` to ``leased/``; the
+rename is atomic, so exactly one worker wins it. While the game runs a thread
+touches the lease every ``lease_seconds / 3``. A lease not touched for
+``lease_seconds`` belongs to a dead worker: whoever notices (the coordinator
+while it waits, or an idle worker) renames it back to ``pending/`` to be played
+again, or records it as failed after ``max_attempts``. Results are written to a
+temporary file and renamed into ``done/``, so readers never see half a result.
+
+Workers share nothing but the directory, so throughput grows with their number
+until the filesystem becomes the bottleneck; several worker processes on one box
+stand in for separate nodes when testing:
+
+    python work_queue.py submit QUEUE --levels 'level*.json' --agents 'B22*' --seeds 0 1 2
+    python work_queue.py worker QUEUE --processes 4          # on each node
+    python work_queue.py collect QUEUE --output results.json  # waits for the last game
+    python work_queue.py status QUEUE
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+from game_runner import _expand_agents, _expand_levels, run_one
+
+SUBDIRS = ("pending", "leased", "done")
+
+
+class WorkQueue:
+    """Tasks and results in a directory, claimed through atomic renames with expiring leases."""
+    def __init__(self, directory, lease_seconds=60.0, max_attempts=3):
+        self.directory = directory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for name in SUBDIRS:
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+    def _path(self, state, task_id):
+        return os.path.join(self.directory, state, f"{task_id}.json")
+
+    def _ids(self, state):
+        return sorted(name[:-5] for name in os.listdir(os.path.join(self.directory, state))
+                      if name.endswith(".json"))
+
+    def _write(self, path, data):
+        tmp = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read(path):
+        with open(path) as f:
+            return json.load(f)
+
+    def submit(self, tasks):
+        """Queue ``tasks`` (dicts of run_one arguments); returns their ids, in order."""
+        start = len(self._ids("pending")) + len(self._ids("leased")) + len(self._ids("done"))
+        ids = []
+        for i, task in enumerate(tasks, start):
+            task_id = f"{i:08d}"
+            self._write(self._path("pending", task_id), dict(task, attempts=0))
+            ids.append(task_id)
+        return ids
+
+    def claim(self, worker):
+        """Lease a pending task: (task_id, task), or None if nothing is pending."""
+        pending = self._ids("pending")
+        # Workers starting together would all race for the first task; spread them out
+        candidates = pending[:64]
+        random.shuffle(candidates)
+        for task_id in candidates + pending[64:]:
+            leased = self._path("leased", task_id)
+            pending = self._path("pending", task_id)
+            try:
+                # Refresh the submission time first: the rename keeps it, and a reaper
+                # must never see a just-claimed lease as already expired
+                os.utime(pending)
+                os.rename(pending, leased)
+                task = self._read(leased)
+            except FileNotFoundError:
+                continue  # another worker got it first
+            if os.path.exists(self._path("done", task_id)):
+                os.remove(leased)  # finished by a worker whose lease had expired
+                continue
+            task["attempts"] += 1
+            task["worker"] = worker
+            self._write(leased, task)
+            return task_id, task
+        return None
+
+    def heartbeat(self, task_id):
+        """Extend the lease; False if it was lost (expired and re-queued)."""
+        try:
+            os.utime(self._path("leased", task_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, task_id, result, worker):
+        """Record the result and release the lease, unless it now belongs to another worker."""
+        self._write(self._path("done", task_id), result)
+        leased = self._path("leased", task_id)
+        try:
+            if self._read(leased).get("worker") == worker:
+                os.remove(leased)
+        except (FileNotFoundError, ValueError):
+            pass  # reaped meanwhile, or being rewritten by a new claimer
+
+    def reap(self):
+        """Re-queue (or fail, after ``max_attempts``) expired leases; returns how many."""
+        reaped = 0
+        now = time.time()
+        for task_id in self._ids("leased"):
+            leased = self._path("leased", task_id)
+            try:
+                if now - os.stat(leased).st_mtime < self.lease_seconds:
+                    continue
+                task = self._read(leased)
+            except (FileNotFoundError, ValueError):
+                continue  # completed meanwhile, or being rewritten by its claimer
+            if task["attempts"] >= self.max_attempts:
+                self.complete(task_id, dict(task, error=f"Abandoned after {task['attempts']} "
+                                                        f"expired leases (last: {task.get('worker')})"),
+                              task.get("worker"))
+            else:
+                try:
+                    os.rename(leased, self._path("pending", task_id))
+                except FileNotFoundError:
+                    continue
+            reaped += 1
+        return reaped
+
+    def status(self):
+        return {state: len(self._ids(state)) for state in SUBDIRS}
+
+    def results(self):
+        return [self._read(self._path("done", task_id)) for task_id in self._ids("done")]
+
+
+def _keep_alive(queue, task_id, stop):
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.heartbeat(task_id):
+            return
+
+
+def work(queue, worker=None, poll=1.0, exit_when_idle=True):
+    """Play tasks from ``queue`` until none is pending or leased; returns how many were played."""
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    played = 0
+    while True:
+        claimed = queue.claim(worker)
+        if claimed is None:
+            queue.reap()
+            status = queue.status()
+            if exit_when_idle and not status["pending"] and not status["leased"]:
+                return played
+            time.sleep(poll)
+            continue
+        task_id, task = claimed
+        stop = threading.Event()
+        beat = threading.Thread(target=_keep_alive, args=(queue, task_id, stop), daemon=True)
+        beat.start()
+        try:
+            result = run_one(task["level"], task["agent"], task.get("seed"), quiet=True,
+                             engine_options=task.get("engine_options"),
+                             cache_dir=task.get("cache_dir"),
+                             early_termination=task.get("early_termination", False))
+        except Exception as e:  # a broken task must not take the worker down
+            result = dict(task, error=f"{type(e).__name__}: {e}")
+        finally:
+            stop.set()
+            beat.join()
+        result.update(worker=worker, attempts=task["attempts"])
+        queue.complete(task_id, result, worker)
+        played += 1
+
+
+def _worker_process(directory, lease_seconds, poll):
+    work(WorkQueue(directory, lease_seconds), poll=poll)
+
+
+def collect(queue, poll=1.0, report=None):
+    """Wait until every task is done, re-queueing expired leases; returns the results."""
+    while True:
+        queue.reap()
+        status = queue.status()
+        if report:
+            report(status)
+        if not status["pending"] and not status["leased"]:
+            return queue.results()
+        time.sleep(poll)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Directory-based tournament work queue.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("submit", help="queue one task per level x agent x seed")
+    p.add_argument("queue")
+    p.add_argument("--levels", nargs="+", required=True)
+    p.add_argument("--agents", nargs="+", required=True)
+    p.add_argument("--seeds", type=int, nargs="+", default=[None])
+    p.add_argument("--cache", metavar="DIR", help="result cache directory shared by workers")
+    p.add_argument("--early-termination", action="store_true")
+    p = sub.add_parser("worker", help="play queued tasks until the queue is empty")
+    p.add_argument("queue")
+    p.add_argument("--processes", type=int, default=1, help="worker processes on this node")
+    p.add_argument("--lease", type=float, default=60.0, help="lease expiry in seconds")
+    p.add_argument("--poll", type=float, default=1.0)
+    p = sub.add_parser("collect", help="wait for all tasks and write the results")
+    p.add_argument("queue")
+    p.add_argument("--output", help="JSON file for the results (default: stdout)")
+    p.add_argument("--lease", type=float, default=60.0)
+    p.add_argument("--poll", type=float, default=1.0)
+    p = sub.add_parser("status", help="count pending, leased and done tasks")
+    p.add_argument("queue")
+    args = parser.parse_args()
+
+    if args.command == "submit":
+        queue = WorkQueue(args.queue)
+        # Absolute paths, so workers started elsewhere find the same files
+        tasks = [{"level": os.path.abspath(level), "agent": agent, "seed": seed,
+                  "cache_dir": args.cache and os.path.abspath(args.cache),
+                  "early_termination": args.early_termination}
+                 for level in _expand_levels(args.levels)
+                 for agent in _expand_agents(args.agents) for seed in args.seeds]
+        ids = queue.submit(tasks)
+        print(f"Queued {len(ids)} tasks in {args.queue}")
+    elif args.command == "worker":
+        if args.processes == 1:
+            played = work(WorkQueue(args.queue, args.lease), poll=args.poll)
+            print(f"Worker played {played} games", file=sys.stderr)
+        else:
+            import multiprocessing
+            processes = [multiprocessing.Process(target=_worker_process,
+                                                 args=(args.queue, args.lease, args.poll))
+                         for _ in range(args.processes)]
+            for proc in processes:
+                proc.start()
+            for proc in processes:
+                proc.join()
+    elif args.command == "collect":
+        queue = WorkQueue(args.queue, args.lease)
+        last = [None]
+
+        def report(status):
+            if status != last[0]:
+                print(f"pending {status['pending']}, leased {status['leased']}, "
+                      f"done {status['done']}", file=sys.stderr)
+                last[0] = status
+        results = collect(queue, args.poll, report)
+        text = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text)
+            print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+        else:
+            print(text)
+    else:
+        print(json.dumps(WorkQueue(args.queue).status()))